@@ -80,8 +80,11 @@ def run_test_suite(test_type, description):
     # Создаем директорию для отчетов
     os.makedirs("reports", exist_ok=True)
 
-    # Команда для запуска тестов
-    cmd = f"python -m pytest tests/{test_type}/ -v --tb=short --html=reports/{test_type}_report.html --self-contained-html"
+    # Команда для запуска тестов (по файлу на воркер pytest-xdist, без записи кеша)
+    cmd = (
+        f"python -m pytest tests/{test_type}/ -v --tb=short -n auto --dist=loadfile "
+        f"-p no:cacheprovider --html=reports/{test_type}_report.html --self-contained-html"
+    )
 
     success = run_command(cmd, f"Запуск {test_type} тестов")
 
@@ -211,6 +214,12 @@ def main():
     # Запускаем тесты
     test_results = {}
 
+    # Unit тесты
+    test_results["unit"] = run_test_suite("unit", "Unit тесты")
+
+    # Тесты веб-интерфейса
+    test_results["ui"] = run_test_suite("ui", "Тесты веб-интерфейса")
+
     # Интеграционные тесты
     test_results["integration"] = run_test_suite("integration", "Интеграционные тесты API")
 
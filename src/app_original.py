@@ -1948,7 +1948,7 @@ if __name__ == "__main__":
     if not os.path.exists(cm.CONFIG_FILE):
         with open(cm.CONFIG_FILE, "w") as f:
             json.dump({"bots": {}}, f)
-    cm.load_configs()
+    cm.safe_load_configs()
     bm.start_all_bots()
 
     logger.info("🚀 Telegram Bot Manager API v2.0 Starting...")
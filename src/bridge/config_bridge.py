@@ -7,6 +7,7 @@ hexagonal architecture's configuration system.
 
 import json
 import logging
+import operator
 import threading
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -32,6 +33,19 @@ class ConfigBridge:
     configuration system and the new hexagonal architecture's configuration system.
     """
     
+    # Legacy config keys checked during validation, paired with BotConfig attributes
+    _VALIDATED_FIELDS = (
+        ("bot_name", "name"),
+        ("telegram_token", "token"),
+        ("openai_api_key", "openai_api_key"),
+        ("assistant_id", "assistant_id"),
+        ("group_context_limit", "group_context_limit"),
+        ("enable_ai_responses", "enable_ai_responses"),
+        ("enable_voice_responses", "enable_voice_responses"),
+    )
+    _LEGACY_KEYS = tuple(key for key, _ in _VALIDATED_FIELDS)
+    _new_config_values = operator.attrgetter(*(attr for _, attr in _VALIDATED_FIELDS))
+    
     def __init__(self, storage_port: StoragePort):
         """Initialize the configuration bridge."""
         self.storage_port = storage_port
@@ -269,15 +283,18 @@ class ConfigBridge:
         }
         
         try:
-            # Compare legacy and new configurations
+            # Fingerprint legacy bots while holding the lock, instead of copying them
             with legacy_config.BOT_CONFIGS_LOCK:
-                legacy_bots = dict(legacy_config.BOT_CONFIGS)
+                legacy_fingerprints = {
+                    bot_id: self._legacy_fingerprint(legacy_data)
+                    for bot_id, legacy_data in legacy_config.BOT_CONFIGS.items()
+                }
             
             new_bots = self.storage_port.list_bot_configs()
             
-            validation_result["total_bots"] = len(legacy_bots)
+            validation_result["total_bots"] = len(legacy_fingerprints)
             
-            for bot_id, legacy_data in legacy_bots.items():
+            for bot_id, legacy_fingerprint in legacy_fingerprints.items():
                 if bot_id not in new_bots:
                     validation_result["discrepancies"].append(
                         f"Bot {bot_id} exists in legacy but not in new system"
@@ -287,7 +304,7 @@ class ConfigBridge:
                 
                 # Compare configurations
                 new_config = new_bots[bot_id]
-                if self._configs_match(legacy_data, new_config):
+                if self._fingerprints_match(legacy_fingerprint, new_config):
                     validation_result["valid_bots"] += 1
                 else:
                     validation_result["discrepancies"].append(
@@ -297,7 +314,7 @@ class ConfigBridge:
             
             # Check for bots that exist only in new system
             for bot_id in new_bots:
-                if bot_id not in legacy_bots:
+                if bot_id not in legacy_fingerprints:
                     validation_result["discrepancies"].append(
                         f"Bot {bot_id} exists in new but not in legacy system"
                     )
@@ -316,21 +333,20 @@ class ConfigBridge:
         
         return validation_result
     
-    def _configs_match(self, legacy_data: Dict, new_config: BotConfig) -> bool:
-        """Check if legacy and new configurations match."""
+    def _legacy_fingerprint(self, legacy_data: Dict) -> Optional[tuple]:
+        """Project a legacy bot entry onto the validated fields (None if malformed)."""
         try:
             legacy_config_data = legacy_data.get("config", {})
-            
-            # Compare basic fields
-            return (
-                legacy_config_data.get("bot_name") == new_config.name and
-                legacy_config_data.get("telegram_token") == new_config.token and
-                legacy_config_data.get("openai_api_key") == new_config.openai_api_key and
-                legacy_config_data.get("assistant_id") == new_config.assistant_id and
-                legacy_config_data.get("group_context_limit") == new_config.group_context_limit and
-                legacy_config_data.get("enable_ai_responses") == new_config.enable_ai_responses and
-                legacy_config_data.get("enable_voice_responses") == new_config.enable_voice_responses
-            )
+            return tuple(legacy_config_data.get(key) for key in self._LEGACY_KEYS)
+        except Exception:
+            return None
+    
+    def _fingerprints_match(self, legacy_fingerprint: Optional[tuple], new_config: BotConfig) -> bool:
+        """Check a legacy fingerprint against the validated fields of a new configuration."""
+        if legacy_fingerprint is None:
+            return False
+        try:
+            return legacy_fingerprint == self._new_config_values(new_config)
         except Exception:
             return False
     
@@ -3,6 +3,11 @@ import logging
 import os
 import threading
 
+try:
+    import orjson  # Быстрый C-парсер JSON (необязательная зависимость)
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 BOT_CONFIGS = {}
@@ -16,177 +21,319 @@ BOT_CONFIGS_LOCK = threading.Lock()
 CONVERSATIONS_LOCK = threading.Lock()
 OPENAI_LOCK = threading.Lock()
 
+
+def _default_admin_bot_config():
+    """Конфигурация административного бота по умолчанию"""
+    return {
+        "enabled": False,
+        "token": "",
+        "admin_users": [],  # Список Telegram ID администраторов
+        "notifications": {
+            "bot_status": True,
+            "high_cpu": True,
+            "errors": True,
+            "weekly_stats": True,
+        },
+    }
+
+
 # Конфигурация административного бота
-ADMIN_BOT_CONFIG = {
-    "enabled": False,
-    "token": "",
-    "admin_users": [],  # Список Telegram ID администраторов
-    "notifications": {"bot_status": True, "high_cpu": True, "errors": True, "weekly_stats": True},
-}
+ADMIN_BOT_CONFIG = _default_admin_bot_config()
+
+
+def _read_json_file(path):
+    """Читает JSON-файл одним вызовом read() и разбирает его (orjson, если доступен)"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _write_json_file(path, data, ensure_ascii=False):
+    """Сериализует данные с отступом 2 и пишет одним вызовом
+
+    Вывод совпадает с json.dumps(data, indent=2, ensure_ascii=ensure_ascii): нестроковые
+    ключи приводятся к строкам. orjson (если доступен) используется только для вывода
+    в UTF-8 без экранирования, так как экранировать не-ASCII символы он не умеет.
+    """
+    if orjson is not None and not ensure_ascii:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        raw = json.dumps(data, indent=2, ensure_ascii=ensure_ascii).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(raw)
+
+
+class ConfigError(Exception):
+    """Файл конфигурации ботов не удалось прочитать или разобрать"""
+
+
+class ConfigStore:
+    """Хранилище конфигураций ботов, привязанное к одному JSON-файлу
+
+    Модульные функции ниже работают с хранилищем поверх глобального состояния
+    (BOT_CONFIGS, CONFIG_FILE, ADMIN_BOT_CONFIG); отдельные экземпляры не делят
+    состояние между собой, поэтому их можно использовать параллельно (например, в тестах).
+    """
+
+    def __init__(self, path, configs=None, lock=None, admin_bot_config=None, next_bot_id=1):
+        self.path = path
+        self.configs = {} if configs is None else configs
+        self.lock = threading.Lock() if lock is None else lock
+        self.admin_bot_config = (
+            _default_admin_bot_config() if admin_bot_config is None else admin_bot_config
+        )
+        self.next_bot_id = next_bot_id
+
+    def _clean_configs(self):
+        """Конфигурации без несериализуемых runtime-объектов (вызывать под self.lock)"""
+        clean_configs = {}
+        for k, v in self.configs.items():
+            clean_bot = {
+                "id": v["id"],
+                "config": v["config"],
+                "status": v.get("status", "stopped"),
+                # Исключаем thread, loop, stop_event - они не сериализуются в JSON
+            }
+            clean_configs[str(k)] = clean_bot
+        return clean_configs
 
+    def load_configs(self):
+        """Загружает конфигурации ботов из файла
 
-def load_configs():
-    """Загружает конфигурации ботов из файла"""
-    global NEXT_BOT_ID, ADMIN_BOT_CONFIG
-    try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE) as f:
-                data = json.load(f)
-                BOT_CONFIGS.clear()
-                
-                # Загрузка обычных ботов
-                if "bots" in data:
-                    for k, v in data["bots"].items():
-                        # Восстанавливаем полную структуру бота с runtime полями
-                        # При загрузке все боты останавливаются (runtime объекты не сохраняются)
-                        bot_entry = {
-                            "id": v["id"],
-                            "config": v["config"],
-                            "status": "stopped",  # Принудительно останавливаем все боты при перезапуске
-                            "thread": None,
-                            "loop": None,
-                            "stop_event": None,
-                        }
-                        BOT_CONFIGS[int(k)] = bot_entry
-
-                    NEXT_BOT_ID = max([int(k) for k in data["bots"].keys()] + [0]) + 1
-                    logger.info(f"Конфигурации ботов загружены из файла: {len(BOT_CONFIGS)} ботов")
-                
-                # Загрузка admin bot конфигурации
-                if "admin_bot" in data and data["admin_bot"]:
-                    ADMIN_BOT_CONFIG.update(data["admin_bot"])
-                    logger.info("Admin bot конфигурация загружена из файла")
-                else:
-                    logger.info("Admin bot конфигурация не найдена в файле, используются значения по умолчанию")
-                    
-        else:
-            logger.info(f"Файл {CONFIG_FILE} не существует, будет создан новый")
-    except Exception as e:
-        logger.error(f"Ошибка загрузки конфигураций: {e}")
+        Отсутствующий файл не считается ошибкой. Если файл не удалось прочитать или
+        разобрать, выбрасывается ConfigError, а текущие конфигурации остаются без изменений.
+        """
+        if not os.path.exists(self.path):
+            logger.info(f"Файл {self.path} не существует, будет создан новый")
+            return
 
+        try:
+            data = _read_json_file(self.path)
 
-def save_configs_async():
-    """Асинхронно сохраняет конфигурации в файл"""
+            # Восстанавливаем полную структуру бота с runtime полями
+            # При загрузке все боты останавливаются (runtime объекты не сохраняются)
+            bots = {
+                int(k): {
+                    "id": v["id"],
+                    "config": v["config"],
+                    # Принудительно останавливаем все боты при перезапуске
+                    "status": "stopped",
+                    "thread": None,
+                    "loop": None,
+                    "stop_event": None,
+                }
+                for k, v in data.get("bots", {}).items()
+            }
+        except Exception as e:
+            raise ConfigError(f"Ошибка загрузки конфигураций из {self.path}: {e}") from e
+
+        self.configs.clear()
+        self.configs.update(bots)
 
-    def save_task():
+        # Загрузка обычных ботов
+        if "bots" in data:
+            self.next_bot_id = max(list(bots) + [0]) + 1
+            logger.info(f"Конфигурации ботов загружены из файла: {len(self.configs)} ботов")
+
+        # Загрузка admin bot конфигурации
+        if "admin_bot" in data and data["admin_bot"]:
+            self.admin_bot_config.update(data["admin_bot"])
+            logger.info("Admin bot конфигурация загружена из файла")
+        else:
+            logger.info(
+                "Admin bot конфигурация не найдена в файле, используются значения по умолчанию"
+            )
+
+    def save_configs_async(self):
+        """Асинхронно сохраняет конфигурации в файл, возвращает поток сохранения"""
+
+        def save_task():
+            try:
+                if os.path.exists(self.path) and not os.access(self.path, os.W_OK):
+                    raise PermissionError(f"Нет прав на запись в {self.path}")
+
+                with self.lock:
+                    data = {"bots": self._clean_configs()}
+                    temp_file = self.path + ".tmp"
+                    # Асинхронное сохранение, как и раньше, экранирует не-ASCII символы (\uXXXX)
+                    _write_json_file(temp_file, data, ensure_ascii=True)
+                    os.replace(temp_file, self.path)
+                    logger.info("Конфигурации ботов сохранены в файл")
+            except Exception as e:
+                logger.error(f"Ошибка сохранения конфигураций: {e}")
+                raise
+
+        thread = threading.Thread(target=save_task, daemon=True)
+        thread.start()
+        return thread
+
+    def save_configs(self):
+        """Синхронно сохраняет конфигурации в файл"""
         try:
-            if os.path.exists(CONFIG_FILE) and not os.access(CONFIG_FILE, os.W_OK):
-                raise PermissionError(f"Нет прав на запись в {CONFIG_FILE}")
-
-            with BOT_CONFIGS_LOCK:
-                # Очищаем конфигурацию от несериализуемых объектов
-                clean_configs = {}
-                for k, v in BOT_CONFIGS.items():
-                    clean_bot = {
-                        "id": v["id"],
-                        "config": v["config"],
-                        "status": v.get("status", "stopped"),
-                        # Исключаем thread, loop, stop_event - они не сериализуются в JSON
-                    }
-                    clean_configs[str(k)] = clean_bot
-
-                data = {"bots": clean_configs}
-                temp_file = CONFIG_FILE + ".tmp"
-                with open(temp_file, "w") as f:
-                    json.dump(data, f, indent=2)
-                os.replace(temp_file, CONFIG_FILE)
-                logger.info("Конфигурации ботов сохранены в файл")
+            if os.path.exists(self.path) and not os.access(self.path, os.W_OK):
+                raise PermissionError(f"Нет прав на запись в {self.path}")
+
+            with self.lock:
+                # Сохраняем обычные боты И admin bot конфигурацию
+                data = {
+                    "bots": self._clean_configs(),
+                    "admin_bot": self.admin_bot_config.copy(),  # Добавляем admin bot конфигурацию
+                }
+
+                temp_file = self.path + ".tmp"
+                _write_json_file(temp_file, data)
+                os.replace(temp_file, self.path)
+                logger.info("Конфигурации ботов и admin bot сохранены в файл")
         except Exception as e:
             logger.error(f"Ошибка сохранения конфигураций: {e}")
             raise
 
-    thread = threading.Thread(target=save_task, daemon=True)
-    thread.start()
+    def get_bot_config(self, bot_id):
+        """Получить конфигурацию бота по ID"""
+        with self.lock:
+            return self.configs.get(bot_id)
+
+    def add_bot_config(self, bot_id, config):
+        """Добавить конфигурацию бота"""
+        with self.lock:
+            self.configs[bot_id] = {
+                "id": bot_id,
+                "config": config,
+                "status": "stopped",
+                "thread": None,
+                "loop": None,
+                "stop_event": None,
+            }
 
+    def update_bot_config(self, bot_id, config):
+        """Обновить конфигурацию бота"""
+        with self.lock:
+            if bot_id in self.configs:
+                self.configs[bot_id]["config"].update(config)
+
+    def delete_bot_config(self, bot_id):
+        """Удалить конфигурацию бота"""
+        with self.lock:
+            if bot_id in self.configs:
+                del self.configs[bot_id]
+
+    def get_all_bot_configs(self):
+        """Получить все конфигурации ботов"""
+        with self.lock:
+            return dict(self.configs)
+
+    def get_bot_count(self):
+        """Получить количество ботов"""
+        with self.lock:
+            return len(self.configs)
+
+    def get_running_bot_count(self):
+        """Получить количество запущенных ботов"""
+        with self.lock:
+            return sum(1 for bot in self.configs.values() if bot.get("status") == "running")
+
+    def clear_all_configs(self):
+        """Очистить все конфигурации"""
+        with self.lock:
+            self.configs.clear()
+            self.next_bot_id = 1
+
+
+class _ModuleConfigStore(ConfigStore):
+    """Хранилище поверх глобальных переменных модуля (BOT_CONFIGS, ADMIN_BOT_CONFIG и др.)
+
+    path и next_bot_id читаются из CONFIG_FILE и NEXT_BOT_ID при каждом обращении, поэтому
+    присваивания config_manager.CONFIG_FILE / NEXT_BOT_ID снаружи продолжают действовать.
+    """
+
+    def __init__(self):
+        super().__init__(
+            CONFIG_FILE, BOT_CONFIGS, BOT_CONFIGS_LOCK, ADMIN_BOT_CONFIG, next_bot_id=NEXT_BOT_ID
+        )
+
+    @property
+    def path(self):
+        return CONFIG_FILE
+
+    @path.setter
+    def path(self, value):
+        global CONFIG_FILE
+        CONFIG_FILE = value
+
+    @property
+    def next_bot_id(self):
+        return NEXT_BOT_ID
+
+    @next_bot_id.setter
+    def next_bot_id(self, value):
+        global NEXT_BOT_ID
+        NEXT_BOT_ID = value
 
-def save_configs():
-    """Синхронно сохраняет конфигурации в файл"""
+
+# Хранилище, которому делегируют модульные функции (создается один раз)
+_DEFAULT_STORE = _ModuleConfigStore()
+
+
+def load_configs():
+    """Загружает конфигурации ботов из файла; при некорректном файле выбрасывает ConfigError"""
+    _DEFAULT_STORE.load_configs()
+
+
+def safe_load_configs():
+    """Как load_configs, но ошибка загрузки только логируется (текущие конфигурации сохраняются)"""
     try:
-        if os.path.exists(CONFIG_FILE) and not os.access(CONFIG_FILE, os.W_OK):
-            raise PermissionError(f"Нет прав на запись в {CONFIG_FILE}")
-
-        with BOT_CONFIGS_LOCK:
-            # Очищаем конфигурацию от несериализуемых объектов
-            clean_configs = {}
-            for k, v in BOT_CONFIGS.items():
-                clean_bot = {
-                    "id": v["id"],
-                    "config": v["config"],
-                    "status": v.get("status", "stopped"),
-                    # Исключаем thread, loop, stop_event - они не сериализуются в JSON
-                }
-                clean_configs[str(k)] = clean_bot
+        load_configs()
+    except ConfigError as e:
+        logger.error(str(e))
 
-            # Сохраняем обычные боты И admin bot конфигурацию
-            data = {
-                "bots": clean_configs,
-                "admin_bot": ADMIN_BOT_CONFIG.copy()  # Добавляем admin bot конфигурацию
-            }
-            
-            temp_file = CONFIG_FILE + ".tmp"
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            os.replace(temp_file, CONFIG_FILE)
-            logger.info("Конфигурации ботов и admin bot сохранены в файл")
-    except Exception as e:
-        logger.error(f"Ошибка сохранения конфигураций: {e}")
-        raise
+
+def save_configs_async():
+    """Асинхронно сохраняет конфигурации в файл, возвращает поток сохранения"""
+    return _DEFAULT_STORE.save_configs_async()
+
+
+def save_configs():
+    """Синхронно сохраняет конфигурации в файл"""
+    _DEFAULT_STORE.save_configs()
 
 
 def get_bot_config(bot_id):
     """Получить конфигурацию бота по ID"""
-    with BOT_CONFIGS_LOCK:
-        return BOT_CONFIGS.get(bot_id)
+    return _DEFAULT_STORE.get_bot_config(bot_id)
 
 
 def add_bot_config(bot_id, config):
     """Добавить конфигурацию бота"""
-    with BOT_CONFIGS_LOCK:
-        BOT_CONFIGS[bot_id] = {
-            "id": bot_id,
-            "config": config,
-            "status": "stopped",
-            "thread": None,
-            "loop": None,
-            "stop_event": None,
-        }
+    _DEFAULT_STORE.add_bot_config(bot_id, config)
 
 
 def update_bot_config(bot_id, config):
     """Обновить конфигурацию бота"""
-    with BOT_CONFIGS_LOCK:
-        if bot_id in BOT_CONFIGS:
-            BOT_CONFIGS[bot_id]["config"].update(config)
+    _DEFAULT_STORE.update_bot_config(bot_id, config)
 
 
 def delete_bot_config(bot_id):
     """Удалить конфигурацию бота"""
-    with BOT_CONFIGS_LOCK:
-        if bot_id in BOT_CONFIGS:
-            del BOT_CONFIGS[bot_id]
+    _DEFAULT_STORE.delete_bot_config(bot_id)
 
 
 def get_all_bot_configs():
     """Получить все конфигурации ботов"""
-    with BOT_CONFIGS_LOCK:
-        return dict(BOT_CONFIGS)
+    return _DEFAULT_STORE.get_all_bot_configs()
 
 
 def get_bot_count():
     """Получить количество ботов"""
-    with BOT_CONFIGS_LOCK:
-        return len(BOT_CONFIGS)
+    return _DEFAULT_STORE.get_bot_count()
 
 
 def get_running_bot_count():
     """Получить количество запущенных ботов"""
-    with BOT_CONFIGS_LOCK:
-        return sum(1 for bot in BOT_CONFIGS.values() if bot.get("status") == "running")
+    return _DEFAULT_STORE.get_running_bot_count()
 
 
 def clear_all_configs():
     """Очистить все конфигурации"""
-    with BOT_CONFIGS_LOCK:
-        BOT_CONFIGS.clear()
-        global NEXT_BOT_ID
-        NEXT_BOT_ID = 1
+    _DEFAULT_STORE.clear_all_configs()
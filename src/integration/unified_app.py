@@ -11,7 +11,7 @@ import os
 import sys
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 
 from flask import Flask
 
@@ -46,15 +46,19 @@ class UnifiedApplication:
     Flask application and the new hexagonal architecture components.
     """
     
-    def __init__(self, config_path: Optional[str] = None, migration_mode: bool = True):
+    def __init__(
+        self,
+        config_path: Optional[Union[str, os.PathLike]] = None,
+        migration_mode: bool = True
+    ):
         """
         Initialize the unified application.
         
         Args:
-            config_path: Path to configuration file
+            config_path: Path to configuration file (str or path-like)
             migration_mode: Whether to run in migration mode (both systems)
         """
-        self.config_path = config_path or "src/bot_configs.json"
+        self.config_path = os.fspath(config_path) if config_path else "src/bot_configs.json"
         self.migration_mode = migration_mode
         
         # Application components
@@ -212,7 +216,7 @@ class UnifiedApplication:
                 with open(legacy_config.CONFIG_FILE, "w") as f:
                     json.dump({"bots": {}}, f)
             
-            legacy_config.load_configs()
+            legacy_config.safe_load_configs()
             
             # Get the legacy app instance
             self.legacy_app = legacy_app.app
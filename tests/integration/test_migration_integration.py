@@ -238,7 +238,7 @@ class TestUnifiedApplicationIntegration:
         """Test unified application initialization."""
         # Setup mocks
         mock_legacy_config.CONFIG_FILE = temp_config_file
-        mock_legacy_config.load_configs = MagicMock()
+        mock_legacy_config.safe_load_configs = MagicMock()
         mock_legacy_app.app = MagicMock()
         
         # Initialize unified app
@@ -267,7 +267,7 @@ class TestUnifiedApplicationIntegration:
         try:
             # Setup mocks
             mock_legacy_config.CONFIG_FILE = temp_config_file
-            mock_legacy_config.load_configs = MagicMock()
+            mock_legacy_config.safe_load_configs = MagicMock()
             mock_legacy_app.app = MagicMock()
             
             # Initialize unified app
@@ -290,7 +290,7 @@ class TestUnifiedApplicationIntegration:
         """Test unified app bot management operations."""
         # Setup mocks
         mock_legacy_config.CONFIG_FILE = temp_config_file
-        mock_legacy_config.load_configs = MagicMock()
+        mock_legacy_config.safe_load_configs = MagicMock()
         mock_legacy_config.BOT_CONFIGS = {
             1: {
                 "id": 1,
@@ -503,7 +503,7 @@ class TestFullIntegrationScenario:
             mock_config.BOT_CONFIGS = config_data["bots"]
             mock_config.BOT_CONFIGS_LOCK = MagicMock()
             mock_config.CONFIG_FILE = config_file
-            mock_config.load_configs = MagicMock()
+            mock_config.safe_load_configs = MagicMock()
             mock_config.save_configs = MagicMock()
             mock_config.ADMIN_BOT_CONFIG = {
                 "enabled": False,
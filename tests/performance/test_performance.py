@@ -2,68 +2,90 @@
 Тесты производительности
 """
 
+import asyncio
 import concurrent.futures
-import threading
+import os
+import resource
+import statistics
 import time
+import tracemalloc
 
+import aiohttp
 import pytest
 from locust import HttpUser, between, task
 
+# Основные API endpoints, общие для нескольких тестов
+_CORE_ENDPOINTS = (
+    "/api/v2/system/health",
+    "/api/v2/system/info",
+    "/api/v2/system/stats",
+    "/api/v2/bots",
+)
+
+
+@pytest.fixture(scope="module")
+def cpu_pool():
+    """Пул потоков для нагрузки в test_cpu_usage, закрывается после тестов модуля"""
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=5, thread_name_prefix="perf-cpu")
+    yield pool
+    pool.shutdown(wait=True)
+
+
+async def _fetch_all(session, base_url, endpoints, concurrency=None):
+    """Выполняет GET-запросы через открытую aiohttp-сессию, не более concurrency одновременно
+
+    Возвращает список кортежей (endpoint, status, elapsed) в порядке endpoints.
+    """
+    semaphore = asyncio.Semaphore(concurrency or max(len(endpoints), 1))
+
+    async def fetch(endpoint):
+        async with semaphore:
+            start_ns = time.perf_counter_ns()
+            async with session.get(f"{base_url}{endpoint}") as response:
+                await response.read()
+                return endpoint, response.status, (time.perf_counter_ns() - start_ns) * 1e-9
+
+    return await asyncio.gather(*(fetch(endpoint) for endpoint in endpoints))
+
+
+async def _get_all(base_url, endpoints, cookies=None, limit=64):
+    """Параллельно выполняет GET-запросы на одном event loop в отдельной сессии"""
+    connector = aiohttp.TCPConnector(limit=limit, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector, cookies=cookies) as session:
+        return await _fetch_all(session, base_url, endpoints)
+
 
 @pytest.mark.performance
 class TestPerformance:
     """Тесты производительности"""
 
-    def test_api_response_time(self, authenticated_session, performance_monitor):
+    @pytest.mark.parametrize("endpoint", _CORE_ENDPOINTS)
+    def test_api_response_time(self, authenticated_session, performance_monitor, endpoint):
         """Тест времени ответа API"""
-        endpoints = [
-            "/api/v2/system/health",
-            "/api/v2/system/info",
-            "/api/v2/system/stats",
-            "/api/v2/bots",
-        ]
-
-        for endpoint in endpoints:
-            performance_monitor.start()
-            response = authenticated_session.get(endpoint)
-            performance_monitor.stop()
+        performance_monitor.start()
+        response = authenticated_session.get(endpoint)
+        performance_monitor.stop()
 
-            assert response.status_code == 200
-            assert performance_monitor.is_within_limit(
-                1.0
-            ), f"Endpoint {endpoint} отвечает слишком медленно: {performance_monitor.get_duration():.2f}s"
+        assert response.status_code == 200
+        assert performance_monitor.is_within_limit(
+            1.0
+        ), f"Endpoint {endpoint} отвечает слишком медленно: {performance_monitor.get_duration():.2f}s"
 
-    def test_concurrent_api_requests(self, authenticated_session, performance_monitor):
+    def test_concurrent_api_requests(self, authenticated_session):
         """Тест одновременных запросов к API"""
 
-        def make_request(endpoint):
-            start_time = time.time()
-            response = authenticated_session.get(endpoint)
-            end_time = time.time()
-            return {
-                "endpoint": endpoint,
-                "status_code": response.status_code,
-                "response_time": end_time - start_time,
-            }
-
-        endpoints = [
-            "/api/v2/system/health",
-            "/api/v2/system/info",
-            "/api/v2/system/stats",
-            "/api/v2/bots",
+        # Выполняем 10 одновременных запросов к каждому endpoint
+        results = [
+            {"endpoint": endpoint, "status_code": status, "response_time": elapsed}
+            for endpoint, status, elapsed in asyncio.run(
+                _get_all(
+                    authenticated_session.base_url,
+                    _CORE_ENDPOINTS * 10,
+                    cookies=authenticated_session.session.cookies.get_dict(),
+                )
+            )
         ]
 
-        # Выполняем 10 одновременных запросов
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = []
-            for _ in range(10):
-                for endpoint in endpoints:
-                    futures.append(executor.submit(make_request, endpoint))
-
-            results = []
-            for future in concurrent.futures.as_completed(futures):
-                results.append(future.result())
-
         # Проверяем результаты
         for result in results:
             assert result["status_code"] == 200
@@ -112,58 +134,61 @@ class TestPerformance:
         ), f"Создание бота слишком медленно: {performance_monitor.get_duration():.2f}s"
 
         bot_id = create_response.json()["data"]["bot_id"]
+        deleted = False
 
-        # Получение информации о боте
-        performance_monitor.start()
-        get_response = authenticated_session.get(f"/api/v2/bots/{bot_id}")
-        performance_monitor.stop()
+        # Сессия общая для класса: бот удаляется даже при падении проверок
+        try:
+            # Получение информации о боте
+            performance_monitor.start()
+            get_response = authenticated_session.get(f"/api/v2/bots/{bot_id}")
+            performance_monitor.stop()
 
-        assert get_response.status_code == 200
-        assert performance_monitor.is_within_limit(
-            1.0
-        ), f"Получение информации о боте слишком медленно: {performance_monitor.get_duration():.2f}s"
+            assert get_response.status_code == 200
+            assert performance_monitor.is_within_limit(
+                1.0
+            ), f"Получение информации о боте слишком медленно: {performance_monitor.get_duration():.2f}s"
 
-        # Обновление бота
-        update_data = {"bot_name": "Updated Bot"}
-        performance_monitor.start()
-        update_response = authenticated_session.put(f"/api/v2/bots/{bot_id}", data=update_data)
-        performance_monitor.stop()
+            # Обновление бота
+            update_data = {"bot_name": "Updated Bot"}
+            performance_monitor.start()
+            update_response = authenticated_session.put(f"/api/v2/bots/{bot_id}", data=update_data)
+            performance_monitor.stop()
 
-        assert update_response.status_code == 200
-        assert performance_monitor.is_within_limit(
-            2.0
-        ), f"Обновление бота слишком медленно: {performance_monitor.get_duration():.2f}s"
+            assert update_response.status_code == 200
+            assert performance_monitor.is_within_limit(
+                2.0
+            ), f"Обновление бота слишком медленно: {performance_monitor.get_duration():.2f}s"
 
-        # Удаление бота
-        performance_monitor.start()
-        delete_response = authenticated_session.delete(f"/api/v2/bots/{bot_id}")
-        performance_monitor.stop()
+            # Удаление бота
+            performance_monitor.start()
+            delete_response = authenticated_session.delete(f"/api/v2/bots/{bot_id}")
+            performance_monitor.stop()
+            deleted = delete_response.status_code == 200
 
-        assert delete_response.status_code == 200
-        assert performance_monitor.is_within_limit(
-            2.0
-        ), f"Удаление бота слишком медленно: {performance_monitor.get_duration():.2f}s"
+            assert delete_response.status_code == 200
+            assert performance_monitor.is_within_limit(
+                2.0
+            ), f"Удаление бота слишком медленно: {performance_monitor.get_duration():.2f}s"
+        finally:
+            if not deleted:
+                authenticated_session.delete(f"/api/v2/bots/{bot_id}")
 
     def test_memory_usage(self, authenticated_session):
         """Тест использования памяти"""
-        import os
-
-        import psutil
-
-        # Получаем PID текущего процесса
-        current_pid = os.getpid()
-        process = psutil.Process(current_pid)
-
-        # Измеряем использование памяти до запросов
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-
-        # Выполняем серию запросов
-        for _ in range(50):
-            response = authenticated_session.get("/api/v2/system/health")
-            assert response.status_code == 200
+        # Текущий объём памяти, выделенной Python (tracemalloc), а не пиковое RSS:
+        # пик не уменьшается, поэтому освобождённая память не отличалась бы от утечки
+        tracemalloc.start()
+        try:
+            initial_memory = tracemalloc.get_traced_memory()[0] / (1024 * 1024)  # MB
+
+            # Выполняем серию запросов
+            for _ in range(50):
+                response = authenticated_session.get("/api/v2/system/health")
+                assert response.status_code == 200
 
-        # Измеряем использование памяти после запросов
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
+            final_memory = tracemalloc.get_traced_memory()[0] / (1024 * 1024)  # MB
+        finally:
+            tracemalloc.stop()
 
         # Проверяем, что утечки памяти нет (увеличение не более 50MB)
         memory_increase = final_memory - initial_memory
@@ -171,13 +196,11 @@ class TestPerformance:
             memory_increase < 50
         ), f"Подозрение на утечку памяти: увеличение на {memory_increase:.2f}MB"
 
-    def test_cpu_usage(self, authenticated_session):
+    def test_cpu_usage(self, authenticated_session, cpu_pool):
         """Тест использования CPU"""
-
-        import psutil
-
-        # Измеряем общее использование CPU системы
-        initial_cpu = psutil.cpu_percent(interval=1)
+        # Время CPU процесса (user + sys) и wall-clock до нагрузки
+        start_time = time.monotonic()
+        initial_usage = resource.getrusage(resource.RUSAGE_SELF)
 
         # Создаем нагрузку
         def make_requests():
@@ -185,22 +208,21 @@ class TestPerformance:
                 response = authenticated_session.get("/api/v2/system/health")
                 assert response.status_code == 200
 
-        # Запускаем несколько потоков
-        threads = []
-        for _ in range(5):
-            thread = threading.Thread(target=make_requests)
-            threads.append(thread)
-            thread.start()
+        # Запускаем нагрузку в нескольких потоках пула и ждем завершения
+        futures = [cpu_pool.submit(make_requests) for _ in range(5)]
+        for future in futures:
+            future.result()
 
-        # Ждем завершения
-        for thread in threads:
-            thread.join()
-
-        # Измеряем CPU после нагрузки
-        final_cpu = psutil.cpu_percent(interval=1)
+        # Загрузка CPU процессом за время нагрузки, в процентах от всех ядер
+        final_usage = resource.getrusage(resource.RUSAGE_SELF)
+        wall_time = time.monotonic() - start_time
+        cpu_time = (final_usage.ru_utime + final_usage.ru_stime) - (
+            initial_usage.ru_utime + initial_usage.ru_stime
+        )
+        cpu_percent = 100 * cpu_time / (wall_time * (os.cpu_count() or 1))
 
         # CPU не должен быть критически высоким (увеличиваем лимит)
-        assert final_cpu < 90, f"Высокое использование CPU: {final_cpu}%"
+        assert cpu_percent < 90, f"Высокое использование CPU: {cpu_percent:.1f}%"
 
     def test_database_performance(self, authenticated_session, test_data_generator):
         """Тест производительности базы данных"""
@@ -208,7 +230,7 @@ class TestPerformance:
         test_configs = test_data_generator.generate_bot_configs(10)
 
         # Измеряем время создания множества ботов
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         created_bots = []
         for config in test_configs.values():
@@ -216,41 +238,47 @@ class TestPerformance:
             if response.status_code == 201:
                 created_bots.append(response.json()["bot_id"])
 
-        creation_time = time.time() - start_time
+        creation_time = (time.perf_counter_ns() - start_ns) * 1e-9
 
         # Проверяем, что создание происходит достаточно быстро
         assert creation_time < 10.0, f"Создание ботов слишком медленно: {creation_time:.2f}s"
 
         # Измеряем время получения списка ботов
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         response = authenticated_session.get("/api/v2/bots")
-        list_time = time.time() - start_time
+        list_time = (time.perf_counter_ns() - start_ns) * 1e-9
 
         assert response.status_code == 200
         assert list_time < 2.0, f"Получение списка ботов слишком медленно: {list_time:.2f}s"
 
-        # Очистка - удаляем созданных ботов
-        for bot_id in created_bots:
-            authenticated_session.delete(f"/api/v2/bots/{bot_id}")
+        # Очистка - удаляем созданных ботов параллельно
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            list(
+                executor.map(
+                    lambda bot_id: authenticated_session.delete(f"/api/v2/bots/{bot_id}"),
+                    created_bots,
+                )
+            )
 
     def test_network_latency(self, authenticated_session):
         """Тест сетевой задержки"""
-        import statistics
-
         latencies = []
 
-        # Выполняем несколько запросов для измерения задержки
+        # Прогревочный запрос: установка соединения не должна попадать в замеры
+        warmup = authenticated_session.get("/api/v2/system/health")
+        assert warmup.status_code == 200
+
+        # Выполняем несколько запросов по уже открытому keep-alive соединению
         for _ in range(20):
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             response = authenticated_session.get("/api/v2/system/health")
-            end_time = time.time()
+            elapsed_ns = time.perf_counter_ns() - start_ns
 
             assert response.status_code == 200
-            latency = (end_time - start_time) * 1000  # в миллисекундах
-            latencies.append(latency)
+            latencies.append(elapsed_ns * 1e-6)  # в миллисекундах
 
         # Вычисляем статистику
-        avg_latency = statistics.mean(latencies)
+        avg_latency = statistics.fmean(latencies)
         max_latency = max(latencies)
         min_latency = min(latencies)
 
@@ -263,26 +291,33 @@ class TestPerformance:
         """Тест масштабируемости"""
         # Тестируем производительность при увеличении нагрузки
         load_levels = [1, 5, 10, 20]
-        response_times = []
 
-        for load in load_levels:
-            start_time = time.time()
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=load) as executor:
-                futures = []
-                for _ in range(load * 5):  # 5 запросов на поток
-                    futures.append(
-                        executor.submit(authenticated_session.get, "/api/v2/system/health")
+        async def sweep():
+            # Одна сессия с пулом под максимальную нагрузку на все уровни:
+            # соединения не переоткрываются, пул не становится узким местом
+            connector = aiohttp.TCPConnector(limit=max(load_levels), keepalive_timeout=30)
+            async with aiohttp.ClientSession(
+                connector=connector, cookies=authenticated_session.session.cookies.get_dict()
+            ) as session:
+                avg_times = []
+                for load in load_levels:
+                    start_ns = time.perf_counter_ns()
+
+                    # Уровень нагрузки = число одновременных запросов (5 запросов на поток)
+                    results = await _fetch_all(
+                        session,
+                        authenticated_session.base_url,
+                        ["/api/v2/system/health"] * (load * 5),
+                        concurrency=load,
                     )
+                    for _, status, _ in results:
+                        assert status == 200
 
-                for future in concurrent.futures.as_completed(futures):
-                    response = future.result()
-                    assert response.status_code == 200
+                    total_time = (time.perf_counter_ns() - start_ns) * 1e-9
+                    avg_times.append(total_time / (load * 5))
+                return avg_times
 
-            end_time = time.time()
-            total_time = end_time - start_time
-            avg_time = total_time / (load * 5)
-            response_times.append(avg_time)
+        response_times = asyncio.run(sweep())
 
         # Проверяем, что производительность не деградирует критически
         for i, response_time in enumerate(response_times):
@@ -299,14 +334,12 @@ class TestPerformance:
         ]
 
         for endpoint in error_endpoints:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             response = authenticated_session.get(endpoint)
-            end_time = time.time()
+            elapsed = (time.perf_counter_ns() - start_ns) * 1e-9
 
             # Проверяем, что ошибки обрабатываются быстро
-            assert (
-                end_time - start_time < 1.0
-            ), f"Обработка ошибки слишком медленная: {end_time - start_time:.2f}s"
+            assert elapsed < 1.0, f"Обработка ошибки слишком медленная: {elapsed:.2f}s"
             assert response.status_code in [
                 404,
                 400,
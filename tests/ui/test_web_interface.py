@@ -2,9 +2,76 @@
 Тесты веб-интерфейса
 """
 
+import concurrent.futures
+
 import pytest
 
-from tests.utils import performance_monitor, test_logger
+from tests.utils import (
+    assertion_helper,
+    find_missing,
+    find_present,
+    performance_monitor,
+    stream_find_missing,
+    test_logger,
+)
+
+# Страницы для проверки доступности: путь, фикстура сессии, группы ключевых слов
+# (страница должна содержать хотя бы одно слово из каждой группы), лимит времени ответа.
+# Выход выполняется в одноразовой сессии, чтобы не разлогинить общую authenticated_session.
+# Публичные страницы проверяются in-process через local_app_client (маркер fast).
+PAGES = [
+    pytest.param(
+        "/login",
+        "local_app_client",
+        [("login",), ("username", "логин"), ("password", "пароль")],
+        3.0,
+        marks=pytest.mark.fast,
+        id="/login",
+    ),
+    pytest.param(
+        "/marketplace",
+        "local_app_client",
+        [("marketplace", "маркетплейс")],
+        5.0,
+        marks=pytest.mark.fast,
+        id="/marketplace",
+    ),
+    pytest.param(
+        "/logout",
+        "disposable_authenticated_session",
+        [("logout", "выход")],
+        3.0,
+        id="/logout",
+    ),
+]
+
+
+# Наборы подстрок для проверки содержимого страниц. Кортежи собираются один раз при импорте
+# и служат ключом кэша скомпилированных шаблонов в find_missing/stream_find_missing.
+DASHBOARD_ELEMENTS = (
+    "bots-dashboard",
+    "stats-cards",
+    "filter-buttons",
+    "bots-grid",
+    "bot-card",
+    "feature-badges",
+    "action-buttons",
+)
+DASHBOARD_CSS = (
+    "linear-gradient",
+    "backdrop-filter",
+    "grid-template-columns",
+    "animation: fadeInUp",
+)
+RESPONSIVE_ELEMENTS = ("media query", "responsive", "mobile", "tablet", "viewport")
+REQUIRED_HTML_ELEMENTS = ("<html", "<head", "<body", "</html>")
+ERROR_INDICATORS = ("error", "exception", "traceback", "undefined", "null reference")
+SECURITY_HEADERS = (
+    "X-Content-Type-Options",
+    "X-Frame-Options",
+    "X-XSS-Protection",
+    "Content-Security-Policy",
+)
 
 
 @pytest.mark.ui
@@ -12,45 +79,31 @@ from tests.utils import performance_monitor, test_logger
 class TestWebInterface:
     """Тесты веб-интерфейса"""
 
-    def test_login_page_accessibility(self, session_manager):
-        """Тест доступности страницы авторизации"""
-        test_logger.info("Тестирование доступности страницы авторизации")
+    @pytest.mark.parametrize("path,session_fixture,keyword_groups,limit", PAGES)
+    def test_page_accessibility(self, request, path, session_fixture, keyword_groups, limit):
+        """Тест доступности страницы: статус, время ответа, HTML и ключевые элементы"""
+        test_logger.info(f"Тестирование доступности страницы {path}")
+        session = request.getfixturevalue(session_fixture)
 
-        performance_monitor.start()
-        response = session_manager.get("/login")
-        performance_monitor.stop()
+        with performance_monitor.measure() as timing:
+            response = session.get(path)
 
         assert response.status_code == 200, f"Ожидался статус 200, получен {response.status_code}"
-        assert performance_monitor.is_within_limit(
-            3.0
-        ), f"Время ответа превышает лимит: {performance_monitor.get_duration()}s"
-
-        # Проверяем, что это HTML страница
-        content_type = response.headers.get("content-type", "")
-        assert "text/html" in content_type, f"Ожидался HTML, получен {content_type}"
+        assert timing.is_within_limit(limit), f"Время ответа превышает лимит: {timing.duration}s"
 
-        # Проверяем наличие ключевых элементов
-        content = response.text
-        assert "login" in content.lower(), "Страница авторизации не найдена"
-        assert "username" in content.lower() or "логин" in content.lower(), "Поле логина не найдено"
-        assert (
-            "password" in content.lower() or "пароль" in content.lower()
-        ), "Поле пароля не найдено"
+        assertion_helper.assert_html_page(response, keyword_groups)
 
-        test_logger.success("Страница авторизации доступна и корректна")
+        test_logger.success(f"Страница {path} доступна и корректна")
 
     def test_main_page_with_authentication(self, authenticated_session):
         """Тест главной страницы с авторизацией"""
         test_logger.info("Тестирование главной страницы с авторизацией")
 
-        performance_monitor.start()
-        response = authenticated_session.get("/")
-        performance_monitor.stop()
+        with performance_monitor.measure() as timing:
+            response = authenticated_session.get("/")
 
         assert response.status_code == 200, f"Ожидался статус 200, получен {response.status_code}"
-        assert performance_monitor.is_within_limit(
-            5.0
-        ), f"Время ответа превышает лимит: {performance_monitor.get_duration()}s"
+        assert timing.is_within_limit(5.0), f"Время ответа превышает лимит: {timing.duration}s"
 
         # Проверяем, что это HTML страница
         content_type = response.headers.get("content-type", "")
@@ -58,36 +111,11 @@ class TestWebInterface:
 
         # Проверяем наличие новых элементов интерфейса
         content = response.text
-        new_elements = [
-            "bots-dashboard",
-            "stats-cards",
-            "filter-buttons",
-            "bots-grid",
-            "bot-card",
-            "feature-badges",
-            "action-buttons",
-        ]
-
-        missing_elements = []
-        for element in new_elements:
-            if element not in content:
-                missing_elements.append(element)
-
+        missing_elements = find_missing(content, DASHBOARD_ELEMENTS)
         assert not missing_elements, f"Отсутствуют элементы интерфейса: {missing_elements}"
 
         # Проверяем CSS стили
-        css_elements = [
-            "linear-gradient",
-            "backdrop-filter",
-            "grid-template-columns",
-            "animation: fadeInUp",
-        ]
-
-        missing_css = []
-        for css in css_elements:
-            if css not in content:
-                missing_css.append(css)
-
+        missing_css = find_missing(content, DASHBOARD_CSS)
         if missing_css:
             test_logger.warning(f"Отсутствуют CSS стили: {missing_css}")
         else:
@@ -95,97 +123,33 @@ class TestWebInterface:
 
         test_logger.success("Главная страница с авторизацией работает корректно")
 
-    def test_main_page_without_authentication(self, session_manager):
+    @pytest.mark.fast
+    def test_main_page_without_authentication(self, local_app_client):
         """Тест главной страницы без авторизации"""
         test_logger.info("Тестирование главной страницы без авторизации")
 
-        performance_monitor.start()
-        response = session_manager.get("/")
-        performance_monitor.stop()
+        with performance_monitor.measure() as timing:
+            response = local_app_client.get("/")
 
         # Должен быть редирект на страницу авторизации
         assert response.status_code in [
             302,
             401,
         ], f"Ожидался статус 302 или 401, получен {response.status_code}"
-        assert performance_monitor.is_within_limit(
-            3.0
-        ), f"Время ответа превышает лимит: {performance_monitor.get_duration()}s"
+        assert timing.is_within_limit(3.0), f"Время ответа превышает лимит: {timing.duration}s"
 
         test_logger.success("Главная страница правильно защищена авторизацией")
 
-    def test_marketplace_page_accessibility(self, session_manager):
-        """Тест доступности страницы маркетплейса"""
-        test_logger.info("Тестирование доступности страницы маркетплейса")
-
-        performance_monitor.start()
-        response = session_manager.get("/marketplace")
-        performance_monitor.stop()
-
-        assert response.status_code == 200, f"Ожидался статус 200, получен {response.status_code}"
-        assert performance_monitor.is_within_limit(
-            5.0
-        ), f"Время ответа превышает лимит: {performance_monitor.get_duration()}s"
-
-        # Проверяем, что это HTML страница
-        content_type = response.headers.get("content-type", "")
-        assert "text/html" in content_type, f"Ожидался HTML, получен {content_type}"
-
-        # Проверяем наличие ключевых элементов маркетплейса
-        content = response.text
-        assert (
-            "marketplace" in content.lower() or "маркетплейс" in content.lower()
-        ), "Страница маркетплейса не найдена"
-
-        test_logger.success("Страница маркетплейса доступна")
-
-    def test_logout_page_accessibility(self, authenticated_session):
-        """Тест доступности страницы выхода"""
-        test_logger.info("Тестирование доступности страницы выхода")
-
-        performance_monitor.start()
-        response = authenticated_session.get("/logout")
-        performance_monitor.stop()
-
-        assert response.status_code == 200, f"Ожидался статус 200, получен {response.status_code}"
-        assert performance_monitor.is_within_limit(
-            3.0
-        ), f"Время ответа превышает лимит: {performance_monitor.get_duration()}s"
-
-        # Проверяем, что это HTML страница
-        content_type = response.headers.get("content-type", "")
-        assert "text/html" in content_type, f"Ожидался HTML, получен {content_type}"
-
-        # Проверяем наличие элементов страницы выхода
-        content = response.text
-        assert (
-            "logout" in content.lower() or "выход" in content.lower()
-        ), "Страница выхода не найдена"
-
-        test_logger.success("Страница выхода доступна")
-
-    def test_dialogs_page_accessibility(self, authenticated_session):
+    def test_dialogs_page_accessibility(self, authenticated_session, first_bot_id):
         """Тест доступности страницы диалогов"""
         test_logger.info("Тестирование доступности страницы диалогов")
+        bot_id = first_bot_id
 
-        # Сначала получаем список ботов
-        response = authenticated_session.get("/api/v2/bots")
-        assert response.status_code == 200
-
-        data = response.json()
-        if not data["data"]:
-            pytest.skip("Нет ботов для тестирования страницы диалогов")
-
-        bot_id = data["data"][0]["id"]
-
-        performance_monitor.start()
-        response = authenticated_session.get(f"/dialogs/{bot_id}")
-        performance_monitor.stop()
+        with performance_monitor.measure() as timing:
+            response = authenticated_session.get(f"/dialogs/{bot_id}")
 
         assert response.status_code == 200, f"Ожидался статус 200, получен {response.status_code}"
-        assert performance_monitor.is_within_limit(
-            5.0
-        ), f"Время ответа превышает лимит: {performance_monitor.get_duration()}s"
+        assert timing.is_within_limit(5.0), f"Время ответа превышает лимит: {timing.duration}s"
 
         # Проверяем, что это HTML страница
         content_type = response.headers.get("content-type", "")
@@ -199,28 +163,16 @@ class TestWebInterface:
 
         test_logger.success(f"Страница диалогов для бота {bot_id} доступна")
 
-    def test_marketplace_bot_page_accessibility(self, session_manager):
+    def test_marketplace_bot_page_accessibility(self, session_manager, first_marketplace_bot_id):
         """Тест доступности страницы бота в маркетплейсе"""
         test_logger.info("Тестирование доступности страницы бота в маркетплейсе")
+        bot_id = first_marketplace_bot_id
 
-        # Сначала получаем список ботов из маркетплейса
-        response = session_manager.get("/api/marketplace/bots")
-        assert response.status_code == 200
-
-        data = response.json()
-        if not data["data"]:
-            pytest.skip("Нет ботов в маркетплейсе для тестирования")
-
-        bot_id = data["data"][0]["id"]
-
-        performance_monitor.start()
-        response = session_manager.get(f"/marketplace/{bot_id}")
-        performance_monitor.stop()
+        with performance_monitor.measure() as timing:
+            response = session_manager.get(f"/marketplace/{bot_id}")
 
         assert response.status_code == 200, f"Ожидался статус 200, получен {response.status_code}"
-        assert performance_monitor.is_within_limit(
-            5.0
-        ), f"Время ответа превышает лимит: {performance_monitor.get_duration()}s"
+        assert timing.is_within_limit(5.0), f"Время ответа превышает лимит: {timing.duration}s"
 
         # Проверяем, что это HTML страница
         content_type = response.headers.get("content-type", "")
@@ -228,23 +180,20 @@ class TestWebInterface:
 
         test_logger.success(f"Страница бота {bot_id} в маркетплейсе доступна")
 
+    @pytest.mark.nightly
     def test_page_responsive_design(self, authenticated_session):
         """Тест адаптивного дизайна страниц"""
         test_logger.info("Тестирование адаптивного дизайна страниц")
 
         # Проверяем главную страницу
-        response = authenticated_session.get("/")
+        response = authenticated_session.get("/", stream=True)
         assert response.status_code == 200
 
-        content = response.text
-
-        # Проверяем наличие адаптивных элементов
-        responsive_elements = ["media query", "responsive", "mobile", "tablet", "viewport"]
-
-        found_responsive = []
-        for element in responsive_elements:
-            if element in content.lower():
-                found_responsive.append(element)
+        # Проверяем наличие адаптивных элементов, не загружая страницу целиком в память
+        missing_responsive = stream_find_missing(response, RESPONSIVE_ELEMENTS, ignore_case=True)
+        found_responsive = [
+            element for element in RESPONSIVE_ELEMENTS if element not in missing_responsive
+        ]
 
         if found_responsive:
             test_logger.success(f"Найдены элементы адаптивного дизайна: {found_responsive}")
@@ -253,23 +202,29 @@ class TestWebInterface:
 
         test_logger.success("Проверка адаптивного дизайна завершена")
 
-    def test_page_load_performance(self, authenticated_session):
+    def test_page_load_performance(self, disposable_authenticated_session):
         """Тест производительности загрузки страниц"""
         test_logger.info("Тестирование производительности загрузки страниц")
+        session = disposable_authenticated_session
 
         pages = [
             ("/", "Главная страница"),
             ("/login", "Страница авторизации"),
             ("/marketplace", "Страница маркетплейса"),
-            ("/logout", "Страница выхода"),
         ]
 
-        for endpoint, name in pages:
-            performance_monitor.start()
-            response = authenticated_session.get(endpoint)
-            performance_monitor.stop()
+        def load_page(endpoint):
+            with performance_monitor.measure() as timing:
+                response = session.get(endpoint)
+            return response, timing.duration
 
-            duration = performance_monitor.get_duration()
+        # Страницы загружаются параллельно; выход - последним, так как он завершает сессию
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            results = list(executor.map(load_page, [endpoint for endpoint, _ in pages]))
+        results.append(load_page("/logout"))
+        pages.append(("/logout", "Страница выхода"))
+
+        for (_, name), (response, duration) in zip(pages, results):
             assert response.status_code == 200, f"{name} вернула статус {response.status_code}"
             assert duration <= 10.0, f"{name} превысила лимит времени: {duration}s > 10s"
 
@@ -288,22 +243,11 @@ class TestWebInterface:
         content = response.text
 
         # Проверяем наличие обязательных элементов
-        required_elements = ["<html", "<head", "<body", "</html>"]
-
-        missing_elements = []
-        for element in required_elements:
-            if element not in content:
-                missing_elements.append(element)
-
+        missing_elements = find_missing(content, REQUIRED_HTML_ELEMENTS)
         assert not missing_elements, f"Отсутствуют обязательные HTML элементы: {missing_elements}"
 
         # Проверяем, что нет очевидных ошибок
-        error_indicators = ["error", "exception", "traceback", "undefined", "null reference"]
-
-        found_errors = []
-        for indicator in error_indicators:
-            if indicator in content.lower():
-                found_errors.append(indicator)
+        found_errors = find_present(content.lower(), ERROR_INDICATORS)
 
         if found_errors:
             test_logger.warning(f"Найдены возможные ошибки: {found_errors}")
@@ -316,23 +260,14 @@ class TestWebInterface:
         """Тест заголовков безопасности страниц"""
         test_logger.info("Тестирование заголовков безопасности страниц")
 
-        response = authenticated_session.get("/")
+        # Нужны только заголовки, поэтому тело страницы не запрашиваем
+        response = authenticated_session.head("/", allow_redirects=True)
         assert response.status_code == 200
 
         headers = response.headers
 
         # Проверяем наличие важных заголовков безопасности
-        security_headers = [
-            "X-Content-Type-Options",
-            "X-Frame-Options",
-            "X-XSS-Protection",
-            "Content-Security-Policy",
-        ]
-
-        found_headers = []
-        for header in security_headers:
-            if header in headers:
-                found_headers.append(header)
+        found_headers = [header for header in SECURITY_HEADERS if header in headers]
 
         if found_headers:
             test_logger.success(f"Найдены заголовки безопасности: {found_headers}")
@@ -7,8 +7,6 @@ import os
 
 # Импортируем модуль для тестирования
 import sys
-import tempfile
-from unittest.mock import patch
 
 import pytest
 
@@ -20,41 +18,37 @@ import config_manager as cm
 class TestConfigManager:
     """Тесты для config_manager"""
 
-    def test_load_configs_success(self, temp_config_file):
+    def test_load_configs_success(self, config_store, temp_config_file):
         """Тест успешной загрузки конфигураций"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
+        config_store.path = temp_config_file
+        config_store.load_configs()
 
-            # Проверяем, что конфигурации загружены
-            assert hasattr(cm, "BOT_CONFIGS")
-            assert isinstance(cm.BOT_CONFIGS, dict)
-            assert "1" in cm.BOT_CONFIGS
+        # Проверяем, что конфигурации загружены (ключи - целые ID ботов)
+        assert 1 in config_store.configs
 
-            bot_config = cm.BOT_CONFIGS["1"]
-            assert bot_config["id"] == 1
-            assert bot_config["config"]["bot_name"] == "Test Bot 1"
+        bot_config = config_store.configs[1]
+        assert bot_config["id"] == 1
+        assert bot_config["config"]["bot_name"] == "Test Bot 1"
 
-    def test_load_configs_file_not_exists(self):
-        """Тест загрузки конфигураций при отсутствии файла"""
-        with patch.object(cm, "CONFIG_FILE", "/nonexistent/file.json"):
-            cm.load_configs()
-            assert cm.BOT_CONFIGS == {}
+    def test_load_configs_file_not_exists(self, config_store):
+        """Тест загрузки конфигураций при отсутствии файла: не ошибка, конфигурации не меняются"""
+        configs_before = dict(config_store.configs)
+        config_store.path = "/nonexistent/file.json"
+        config_store.load_configs()
+        assert config_store.configs == configs_before
 
-    def test_load_configs_invalid_json(self):
+    def test_load_configs_invalid_json(self, config_store, tmp_path):
         """Тест загрузки конфигураций с невалидным JSON"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            f.write('{"invalid": json}')
-            temp_file = f.name
-
-        try:
-            with patch.object(cm, "CONFIG_FILE", temp_file):
-                cm.load_configs()
-                assert cm.BOT_CONFIGS == {}
-        finally:
-            os.unlink(temp_file)
-
-    def test_save_configs_success(self, temp_config_file):
+        temp_file = tmp_path / "cfg.json"
+        temp_file.write_text('{"invalid": json}')
+        config_store.path = str(temp_file)
+
+        with pytest.raises(cm.ConfigError):
+            config_store.load_configs()
+
+    def test_save_configs_success(self, config_store, temp_config_file):
         """Тест успешного сохранения конфигураций"""
+        config_store.path = temp_config_file
         test_configs = {
             "bots": {
                 "1": {
@@ -73,196 +67,141 @@ class TestConfigManager:
             }
         }
 
-        cm.BOT_CONFIGS = test_configs["bots"]
-
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.save_configs()
+        config_store.configs = test_configs["bots"]
+        config_store.save_configs()
 
-            # Проверяем, что файл сохранен
-            assert os.path.exists(temp_config_file)
+        # Проверяем содержимое сохраненного файла (отсутствие файла даст FileNotFoundError)
+        # Вместе с ботами сохраняется конфигурация admin bot
+        saved_data = cm._read_json_file(temp_config_file)
+        assert saved_data == {**test_configs, "admin_bot": config_store.admin_bot_config}
 
-            with open(temp_config_file) as f:
-                saved_data = json.load(f)
-
-            assert saved_data == test_configs
-
-    def test_save_configs_async(self, temp_config_file):
+    def test_save_configs_async(self, config_store, temp_config_file):
         """Тест асинхронного сохранения конфигураций"""
+        config_store.path = temp_config_file
         test_configs = {"1": {"id": 1, "config": {"bot_name": "Test Bot"}, "status": "stopped"}}
 
-        cm.BOT_CONFIGS = test_configs
+        config_store.configs = test_configs
+        config_store.save_configs_async().join(timeout=5)
 
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.save_configs_async()
+        # Проверяем, что файл сохранен
+        assert os.path.exists(temp_config_file)
 
-            # Проверяем, что файл сохранен
-            assert os.path.exists(temp_config_file)
+    def test_saved_file_format(self, config_store, temp_config_file):
+        """Тест формата файла: как у json.dumps(indent=2), с orjson и без него"""
+        config_store.path = temp_config_file
+        bot_config = {"bot_name": "Тестовый бот", "limits": {10: "x"}}  # int-ключ внутри конфига
+        config_store.configs = {1: {"id": 1, "config": bot_config, "status": "stopped"}}
+        expected_bots = {"1": {"id": 1, "config": bot_config, "status": "stopped"}}
 
-    def test_get_bot_config_success(self, temp_config_file):
-        """Тест получения конфигурации бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
+        config_store.save_configs()
+        with open(temp_config_file, encoding="utf-8") as f:
+            content = f.read()
+        expected = {"bots": expected_bots, "admin_bot": config_store.admin_bot_config}
+        assert content == json.dumps(expected, indent=2, ensure_ascii=False)
 
-            bot_config = cm.get_bot_config(1)
-            assert bot_config is not None
-            assert bot_config["config"]["bot_name"] == "Test Bot 1"
+        config_store.save_configs_async().join(timeout=5)
+        with open(temp_config_file, encoding="utf-8") as f:
+            content = f.read()
+        assert content == json.dumps({"bots": expected_bots}, indent=2)
 
-    def test_get_bot_config_not_found(self, temp_config_file):
-        """Тест получения конфигурации несуществующего бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
+    def test_get_bot_config_success(self, config_store):
+        """Тест получения конфигурации бота"""
+        bot_config = config_store.get_bot_config(1)
+        assert bot_config is not None
+        assert bot_config["config"]["bot_name"] == "Test Bot 1"
 
-            bot_config = cm.get_bot_config(999)
-            assert bot_config is None
+    def test_get_bot_config_not_found(self, config_store):
+        """Тест получения конфигурации несуществующего бота"""
+        bot_config = config_store.get_bot_config(999)
+        assert bot_config is None
 
-    def test_update_bot_config_success(self, temp_config_file):
+    def test_update_bot_config_success(self, config_store):
         """Тест обновления конфигурации бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            new_config = {
-                "bot_name": "Updated Bot",
-                "telegram_token": "updated_token",
-                "openai_api_key": "updated_key",
-                "assistant_id": "updated_assistant",
-                "enable_ai_responses": False,
-                "enable_voice_responses": True,
-                "group_context_limit": 20,
-            }
-
-            success = cm.update_bot_config(1, new_config)
-            assert success is True
+        new_config = {
+            "bot_name": "Updated Bot",
+            "telegram_token": "updated_token",
+            "openai_api_key": "updated_key",
+            "assistant_id": "updated_assistant",
+            "enable_ai_responses": False,
+            "enable_voice_responses": True,
+            "group_context_limit": 20,
+        }
 
-            # Проверяем, что конфигурация обновлена
-            updated_config = cm.get_bot_config(1)
-            assert updated_config["config"]["bot_name"] == "Updated Bot"
-            assert updated_config["config"]["enable_ai_responses"] is False
+        config_store.update_bot_config(1, new_config)
 
-    def test_update_bot_config_not_found(self, temp_config_file):
-        """Тест обновления конфигурации несуществующего бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
+        # Проверяем, что конфигурация обновлена
+        updated_config = config_store.get_bot_config(1)
+        assert updated_config["config"]["bot_name"] == "Updated Bot"
+        assert updated_config["config"]["enable_ai_responses"] is False
 
-            new_config = {"bot_name": "Updated Bot"}
-            success = cm.update_bot_config(999, new_config)
-            assert success is False
+    def test_update_bot_config_not_found(self, config_store):
+        """Тест обновления конфигурации несуществующего бота: бот не создается"""
+        new_config = {"bot_name": "Updated Bot"}
+        config_store.update_bot_config(999, new_config)
+        assert config_store.get_bot_config(999) is None
 
-    def test_delete_bot_config_success(self, temp_config_file):
+    def test_delete_bot_config_success(self, config_store):
         """Тест удаления конфигурации бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            # Проверяем, что бот существует
-            assert "1" in cm.BOT_CONFIGS
-
-            success = cm.delete_bot_config(1)
-            assert success is True
+        # Проверяем, что бот существует
+        assert 1 in config_store.configs
 
-            # Проверяем, что бот удален
-            assert "1" not in cm.BOT_CONFIGS
+        config_store.delete_bot_config(1)
 
-    def test_delete_bot_config_not_found(self, temp_config_file):
-        """Тест удаления несуществующей конфигурации бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
+        # Проверяем, что бот удален
+        assert 1 not in config_store.configs
 
-            success = cm.delete_bot_config(999)
-            assert success is False
+    def test_delete_bot_config_not_found(self, config_store):
+        """Тест удаления несуществующей конфигурации бота: остальные боты не затрагиваются"""
+        bot_count = config_store.get_bot_count()
+        config_store.delete_bot_config(999)
+        assert config_store.get_bot_count() == bot_count
 
-    def test_add_bot_config_success(self, temp_config_file):
+    def test_add_bot_config_success(self, config_store):
         """Тест добавления новой конфигурации бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            new_bot_config = {
-                "bot_name": "New Bot",
-                "telegram_token": "new_token",
-                "openai_api_key": "new_key",
-                "assistant_id": "new_assistant",
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "group_context_limit": 15,
-            }
+        new_bot_config = {
+            "bot_name": "New Bot",
+            "telegram_token": "new_token",
+            "openai_api_key": "new_key",
+            "assistant_id": "new_assistant",
+            "enable_ai_responses": True,
+            "enable_voice_responses": False,
+            "group_context_limit": 15,
+        }
 
-            bot_id = cm.add_bot_config(new_bot_config)
-            assert bot_id is not None
+        bot_id = config_store.next_bot_id
+        config_store.add_bot_config(bot_id, new_bot_config)
 
-            # Проверяем, что бот добавлен
-            added_config = cm.get_bot_config(bot_id)
-            assert added_config is not None
-            assert added_config["config"]["bot_name"] == "New Bot"
+        # Проверяем, что бот добавлен остановленным
+        added_config = config_store.get_bot_config(bot_id)
+        assert added_config is not None
+        assert added_config["config"]["bot_name"] == "New Bot"
+        assert added_config["status"] == "stopped"
 
-    def test_get_all_bot_configs(self, temp_config_file):
+    def test_get_all_bot_configs(self, config_store):
         """Тест получения всех конфигураций ботов"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            all_configs = cm.get_all_bot_configs()
-            assert isinstance(all_configs, dict)
-            assert len(all_configs) > 0
-            assert "1" in all_configs
-
-    def test_get_bot_status_success(self, temp_config_file):
-        """Тест получения статуса бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            status = cm.get_bot_status(1)
-            assert status == "stopped"
+        all_configs = config_store.get_all_bot_configs()
+        assert 1 in all_configs
+        # Возвращается копия: изменение результата не затрагивает хранилище
+        all_configs.clear()
+        assert config_store.get_bot_count() == 1
 
-    def test_get_bot_status_not_found(self, temp_config_file):
-        """Тест получения статуса несуществующего бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
+    def test_bot_status_after_load(self, config_store):
+        """Тест статуса бота: загруженные боты остановлены"""
+        assert config_store.get_bot_config(1)["status"] == "stopped"
 
-            status = cm.get_bot_status(999)
-            assert status is None
+    def test_get_running_bot_count(self, config_store):
+        """Тест подсчета работающих ботов"""
+        assert config_store.get_running_bot_count() == 0
 
-    def test_set_bot_status_success(self, temp_config_file):
-        """Тест установки статуса бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
+        config_store.configs[1]["status"] = "running"
+        assert config_store.get_running_bot_count() == 1
 
-            success = cm.set_bot_status(1, "running")
-            assert success is True
+    def test_clear_all_configs(self, config_store):
+        """Тест очистки всех конфигураций"""
+        config_store.clear_all_configs()
 
-            # Проверяем, что статус обновлен
-            status = cm.get_bot_status(1)
-            assert status == "running"
-
-    def test_set_bot_status_not_found(self, temp_config_file):
-        """Тест установки статуса несуществующего бота"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            success = cm.set_bot_status(999, "running")
-            assert success is False
-
-    def test_get_running_bots(self, temp_config_file):
-        """Тест получения списка работающих ботов"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            # Добавляем работающий бот
-            cm.set_bot_status(1, "running")
-
-            running_bots = cm.get_running_bots()
-            assert isinstance(running_bots, list)
-            assert len(running_bots) > 0
-            assert 1 in running_bots
-
-    def test_get_stopped_bots(self, temp_config_file):
-        """Тест получения списка остановленных ботов"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            # Устанавливаем статус остановленного бота
-            cm.set_bot_status(1, "stopped")
-
-            stopped_bots = cm.get_stopped_bots()
-            assert isinstance(stopped_bots, list)
-            assert len(stopped_bots) > 0
-            assert 1 in stopped_bots
+        assert config_store.get_bot_count() == 0
+        assert config_store.next_bot_id == 1
 
     def test_validate_bot_config_success(self):
         """Тест валидации корректной конфигурации бота"""
@@ -293,56 +232,62 @@ class TestConfigManager:
             result = cm.validate_bot_config(invalid_config)
             assert result is False
 
-    def test_backup_configs(self, temp_config_file):
-        """Тест создания резервной копии конфигураций"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            # Создаем резервную копию
-            backup_path = cm.backup_configs()
-
-            # Проверяем, что файл резервной копии создан
-            assert os.path.exists(backup_path)
-
-            # Проверяем содержимое резервной копии
-            with open(backup_path) as f:
-                backup_data = json.load(f)
-
-            assert backup_data == {"bots": cm.BOT_CONFIGS}
-
-            # Очистка
-            os.unlink(backup_path)
-
-    def test_restore_configs_from_backup(self, temp_config_file):
-        """Тест восстановления конфигураций из резервной копии"""
-        with patch.object(cm, "CONFIG_FILE", temp_config_file):
-            cm.load_configs()
-
-            # Создаем резервную копию
-            backup_path = cm.backup_configs()
-
-            # Изменяем конфигурацию
-            cm.update_bot_config(1, {"bot_name": "Modified Bot"})
-
-            # Восстанавливаем из резервной копии
-            success = cm.restore_configs_from_backup(backup_path)
-            assert success is True
-
-            # Проверяем, что конфигурация восстановлена
-            restored_config = cm.get_bot_config(1)
-            assert restored_config["config"]["bot_name"] == "Test Bot 1"
-
-            # Очистка
-            os.unlink(backup_path)
-
-    def test_restore_configs_invalid_backup(self):
-        """Тест восстановления из невалидной резервной копии"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            f.write('{"invalid": json}')
-            invalid_backup = f.name
-
-        try:
-            success = cm.restore_configs_from_backup(invalid_backup)
-            assert success is False
-        finally:
-            os.unlink(invalid_backup)
+    def test_save_and_load_roundtrip(self, config_store, tmp_path):
+        """Тест сохранения копии конфигураций и восстановления из нее"""
+        backup_path = str(tmp_path / "backup.json")
+        cm.ConfigStore(backup_path, config_store.configs).save_configs()
+
+        # Изменяем конфигурацию
+        config_store.update_bot_config(1, {"bot_name": "Modified Bot"})
+
+        # Восстанавливаем из копии
+        config_store.path = backup_path
+        config_store.load_configs()
+
+        restored_config = config_store.get_bot_config(1)
+        assert restored_config["config"]["bot_name"] == "Test Bot 1"
+        assert config_store.next_bot_id == 2
+
+    def test_load_configs_invalid_file_keeps_configs(self, config_store, tmp_path):
+        """Тест загрузки невалидного файла: ConfigError, текущие конфигурации не меняются"""
+        invalid_file = tmp_path / "backup.json"
+        invalid_file.write_text('{"invalid": json}')
+        configs_before = dict(config_store.configs)
+        config_store.path = str(invalid_file)
+
+        with pytest.raises(cm.ConfigError):
+            config_store.load_configs()
+        assert config_store.configs == configs_before
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '{"bots": {"1": {"id": 1}}}',  # нет поля config
+            '{"bots": {"abc": {"id": 1, "config": {}}}}',  # ID бота не число
+            '{"bots": []}',  # bots не словарь
+            "[]",  # корень не объект
+        ],
+    )
+    def test_load_configs_invalid_structure(self, config_store, tmp_path, content):
+        """Тест загрузки файла с корректным JSON, но неверной структурой: ConfigError"""
+        invalid_file = tmp_path / "cfg.json"
+        invalid_file.write_text(content)
+        configs_before = dict(config_store.configs)
+        config_store.path = str(invalid_file)
+
+        with pytest.raises(cm.ConfigError):
+            config_store.load_configs()
+        assert config_store.configs == configs_before
+
+    def test_safe_load_configs_logs_error(self, tmp_path, monkeypatch, caplog):
+        """Тест safe_load_configs: ошибка загрузки логируется, глобальные конфигурации не меняются"""
+        invalid_file = tmp_path / "cfg.json"
+        invalid_file.write_text('{"invalid": json}')
+        monkeypatch.setattr(cm, "CONFIG_FILE", str(invalid_file))
+        configs_before = dict(cm.BOT_CONFIGS)
+
+        with caplog.at_level("ERROR", logger=cm.logger.name):
+            cm.safe_load_configs()
+
+        assert cm.BOT_CONFIGS == configs_before
+        assert any(str(invalid_file) in record.getMessage() for record in caplog.records)
@@ -0,0 +1,35 @@
+"""
+Common configuration for use case tests.
+
+Use case tests run fully in-process against mocked ports, so they are
+marked ``fast`` (no live server needed) and are safe to run with
+``pytest -n auto``. Async use case tests run on uvloop when it is
+installed; otherwise pytest-asyncio falls back to the default asyncio
+event loop.
+"""
+
+from pathlib import Path
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
+
+if uvloop is not None:
+
+    # Hook is provided by pytest-asyncio>=1.4.0 (pinned in pyproject.toml); an older
+    # plugin rejects it as unknown instead of silently running without uvloop.
+    def pytest_asyncio_loop_factories(config, item):
+        """Create event loops for async use case tests with uvloop."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark use case tests as fast: they never talk to the running application."""
+    usecases_dir = Path(__file__).parent
+    for item in items:
+        if usecases_dir in item.path.parents:
+            item.add_marker(pytest.mark.fast)
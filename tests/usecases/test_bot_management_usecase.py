@@ -6,58 +6,170 @@ that orchestrates bot domain entities and external adapters.
 """
 
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import Mock
 from datetime import datetime
 
 from core.usecases.bot_management import BotManagementUseCase
-from core.domain.bot import Bot, BotConfig, BotStatus
+from core.domain.bot import BotConfig, BotStatus
+
+
+# Storage-level bot data with a fixed timestamp (tests never inspect it)
+_TIMESTAMP = datetime(2024, 1, 1).isoformat()
+_BOT_CONFIG_TEMPLATE = {
+    "name": "Test Bot",
+    "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
+    "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
+    "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
+    "group_context_limit": 15,
+    "enable_ai_responses": True,
+    "enable_voice_responses": False,
+    "voice_model": "tts-1",
+    "voice_type": "alloy",
+}
+_BOT_DATA_TEMPLATE = {
+    "status": "stopped",
+    "created_at": _TIMESTAMP,
+    "updated_at": _TIMESTAMP,
+    "last_error": None,
+    "message_count": 0,
+    "voice_message_count": 0,
+}
+
+
+def make_bot_data(name="Test Bot", status="stopped", config=None, **overrides):
+    """Build storage-level bot data from the shared template."""
+    bot_config = {**_BOT_CONFIG_TEMPLATE, "name": name, **(config or {})}
+    return {**_BOT_DATA_TEMPLATE, "status": status, **overrides, "config": bot_config}
+
+
+class Ready:
+    """Awaitable that is already done: ``await Ready(value)`` returns ``value``.
+
+    Cheaper than AsyncMock for the async telegram port calls: a plain Mock
+    returning a shared Ready still records calls, but awaiting it creates no
+    coroutine and needs no running event loop to build.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __await__(self):
+        return self.value
+        yield  # pragma: no cover - makes __await__ a generator
+
+
+# Default return values of the telegram port mock, restored before every test
+TELEGRAM_PORT_DEFAULTS = {
+    "validate_token": Ready(True),
+    "get_me": Ready({"id": 123456789, "username": "test_bot", "first_name": "Test Bot"}),
+}
+
+
+class FakeStoragePort:
+    """In-memory storage port: plain methods over a dict of bot data.
+
+    Every call is recorded in ``calls`` as ``(method_name, *args)``.
+    """
+
+    def __init__(self):
+        self.bots = {}
+        self.calls = []
+
+    def reset(self):
+        """Forget all bots and recorded calls."""
+        self.bots.clear()
+        self.calls.clear()
+
+    def calls_of(self, name):
+        """Arguments of every recorded call to ``name``."""
+        return [call[1:] for call in self.calls if call[0] == name]
+
+    def get_bot_config(self, bot_id):
+        self.calls.append(("get_bot_config", bot_id))
+        return self.bots.get(bot_id)
+
+    def add_bot_config(self, bot_id, config):
+        self.calls.append(("add_bot_config", bot_id, config))
+        self.bots[bot_id] = config
+
+    def update_bot_config(self, bot_id, config):
+        self.calls.append(("update_bot_config", bot_id, config))
+        self.bots[bot_id] = config
+
+    def delete_bot_config(self, bot_id):
+        self.calls.append(("delete_bot_config", bot_id))
+        self.bots.pop(bot_id, None)
+
+    def get_all_bot_configs(self):
+        self.calls.append(("get_all_bot_configs",))
+        return self.bots
+
+    def get_bot_count(self):
+        self.calls.append(("get_bot_count",))
+        return len(self.bots)
+
+    def get_running_bot_count(self):
+        self.calls.append(("get_running_bot_count",))
+        return sum(1 for bot in self.bots.values() if bot["status"] == "running")
+
+
+@pytest.fixture(scope="module")
+def mock_telegram_port():
+    """Create mock telegram port (shared by the module, reset before each test)."""
+    return Mock()
+
+
+@pytest.fixture(scope="module")
+def storage_port():
+    """Create fake storage port (shared by the module, reset before each test)."""
+    return FakeStoragePort()
+
+
+@pytest.fixture(scope="module")
+def use_case(mock_telegram_port, storage_port):
+    """Create use case instance."""
+    return BotManagementUseCase(mock_telegram_port, storage_port)
+
+
+@pytest.fixture(scope="module")
+def bots_data():
+    """Storage data for one running and one stopped bot (shared: tests only read it)."""
+    return {
+        1: make_bot_data(name="Bot 1", status="running", message_count=10, voice_message_count=2),
+        2: make_bot_data(
+            name="Bot 2",
+            message_count=5,
+            config={"telegram_token": "5123456789:DEFdefGHIjklMNOpqrsTUVwxyz"},
+        ),
+    }
+
+
+@pytest.fixture(scope="module")
+def valid_bot_config():
+    """Create valid bot configuration (shared: tests only read it)."""
+    return BotConfig(
+        name="Test Bot",
+        telegram_token="5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
+        openai_api_key="sk-test1234567890abcdefghijklmnopqrstuvwxyz",
+        assistant_id="asst_test1234567890abcdefghijklmnopqrstuvwxyz",
+    )
 
 
 class TestBotManagementUseCase:
     """Test BotManagementUseCase."""
 
-    @pytest.fixture
-    def mock_telegram_port(self):
-        """Create mock telegram port."""
-        mock = Mock()
-        mock.validate_token = AsyncMock(return_value=True)
-        mock.get_me = AsyncMock(return_value={
-            "id": 123456789,
-            "username": "test_bot",
-            "first_name": "Test Bot"
-        })
-        return mock
-
-    @pytest.fixture
-    def mock_storage_port(self):
-        """Create mock storage port."""
-        mock = Mock()
-        mock.get_bot_config = Mock(return_value=None)
-        mock.get_all_bot_configs = Mock(return_value={})
-        mock.add_bot_config = Mock()
-        mock.update_bot_config = Mock()
-        mock.delete_bot_config = Mock()
-        mock.get_bot_count = Mock(return_value=0)
-        mock.get_running_bot_count = Mock(return_value=0)
-        return mock
-
-    @pytest.fixture
-    def use_case(self, mock_telegram_port, mock_storage_port):
-        """Create use case instance."""
-        return BotManagementUseCase(mock_telegram_port, mock_storage_port)
-
-    @pytest.fixture
-    def valid_bot_config(self):
-        """Create valid bot configuration."""
-        return BotConfig(
-            name="Test Bot",
-            telegram_token="5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-            openai_api_key="sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-            assistant_id="asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-        )
+    @pytest.fixture(autouse=True)
+    def _reset_ports(self, mock_telegram_port, storage_port):
+        """Clear calls, stored bots and per-test overrides, then restore default return values."""
+        mock_telegram_port.reset_mock(return_value=True, side_effect=True)
+        for name, value in TELEGRAM_PORT_DEFAULTS.items():
+            getattr(mock_telegram_port, name).return_value = value
+        storage_port.reset()
 
-    @pytest.mark.asyncio
-    async def test_create_bot_success(self, use_case, valid_bot_config, mock_storage_port):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_create_bot_success(self, use_case, valid_bot_config, storage_port):
         """Test successful bot creation."""
         # Act
         bot = await use_case.create_bot(valid_bot_config)
@@ -67,9 +179,9 @@ class TestBotManagementUseCase:
         assert bot.id == 1
         assert bot.config.name == "Test Bot"
         assert bot.status == BotStatus.STOPPED
-        mock_storage_port.add_bot_config.assert_called_once_with(1, bot.to_dict())
+        assert storage_port.calls_of("add_bot_config") == [(1, bot.to_dict())]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_create_bot_invalid_config(self, use_case):
         """Test bot creation with invalid configuration."""
         # Arrange
@@ -84,39 +196,20 @@ class TestBotManagementUseCase:
         with pytest.raises(ValueError, match="Invalid bot configuration"):
             await use_case.create_bot(invalid_config)
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_create_bot_invalid_token(self, use_case, valid_bot_config, mock_telegram_port):
         """Test bot creation with invalid token."""
         # Arrange
-        mock_telegram_port.validate_token = AsyncMock(return_value=False)
+        mock_telegram_port.validate_token.return_value = Ready(False)
 
         # Act & Assert
         with pytest.raises(ValueError, match="Invalid Telegram token"):
             await use_case.create_bot(valid_bot_config)
 
-    def test_get_bot_success(self, use_case, mock_storage_port):
+    def test_get_bot_success(self, use_case, storage_port):
         """Test getting bot by ID."""
         # Arrange
-        bot_data = {
-            "config": {
-                "name": "Test Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "stopped",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 0,
-            "voice_message_count": 0,
-        }
-        mock_storage_port.get_bot_config.return_value = bot_data
+        storage_port.bots[1] = make_bot_data()
 
         # Act
         bot = use_case.get_bot(1)
@@ -125,100 +218,43 @@ class TestBotManagementUseCase:
         assert bot is not None
         assert bot.id == 1
         assert bot.config.name == "Test Bot"
-        mock_storage_port.get_bot_config.assert_called_once_with(1)
+        assert storage_port.calls_of("get_bot_config") == [(1,)]
 
-    def test_get_bot_not_found(self, use_case, mock_storage_port):
+    def test_get_bot_not_found(self, use_case):
         """Test getting non-existent bot."""
-        # Arrange
-        mock_storage_port.get_bot_config.return_value = None
-
         # Act
         bot = use_case.get_bot(999)
 
         # Assert
         assert bot is None
 
-    def test_get_all_bots(self, use_case, mock_storage_port):
-        """Test getting all bots."""
+    @pytest.mark.parametrize(
+        "method,expected",
+        [
+            (
+                "get_all_bots",
+                [(1, "Bot 1", BotStatus.RUNNING), (2, "Bot 2", BotStatus.STOPPED)],
+            ),
+            ("get_running_bots", [(1, "Bot 1", BotStatus.RUNNING)]),
+            ("get_stopped_bots", [(2, "Bot 2", BotStatus.STOPPED)]),
+        ],
+    )
+    def test_list_bots(self, use_case, storage_port, bots_data, method, expected):
+        """Test getting all, running and stopped bots."""
         # Arrange
-        bots_data = {
-            1: {
-                "config": {
-                    "name": "Bot 1",
-                    "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                    "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "group_context_limit": 15,
-                    "enable_ai_responses": True,
-                    "enable_voice_responses": False,
-                    "voice_model": "tts-1",
-                    "voice_type": "alloy",
-                },
-                "status": "running",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "last_error": None,
-                "message_count": 10,
-                "voice_message_count": 2,
-            },
-            2: {
-                "config": {
-                    "name": "Bot 2",
-                    "telegram_token": "5123456789:DEFdefGHIjklMNOpqrsTUVwxyz",
-                    "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "group_context_limit": 15,
-                    "enable_ai_responses": True,
-                    "enable_voice_responses": False,
-                    "voice_model": "tts-1",
-                    "voice_type": "alloy",
-                },
-                "status": "stopped",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "last_error": None,
-                "message_count": 5,
-                "voice_message_count": 0,
-            }
-        }
-        mock_storage_port.get_all_bot_configs.return_value = bots_data
+        storage_port.bots.update(bots_data)
 
         # Act
-        bots = use_case.get_all_bots()
+        bots = getattr(use_case, method)()
 
         # Assert
-        assert len(bots) == 2
-        assert bots[0].id == 1
-        assert bots[0].config.name == "Bot 1"
-        assert bots[0].status == BotStatus.RUNNING
-        assert bots[1].id == 2
-        assert bots[1].config.name == "Bot 2"
-        assert bots[1].status == BotStatus.STOPPED
-
-    @pytest.mark.asyncio
-    async def test_update_bot_success(self, use_case, valid_bot_config, mock_storage_port):
+        assert [(bot.id, bot.config.name, bot.status) for bot in bots] == expected
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_update_bot_success(self, use_case, valid_bot_config, storage_port):
         """Test successful bot update."""
         # Arrange
-        existing_bot_data = {
-            "config": {
-                "name": "Old Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "stopped",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 0,
-            "voice_message_count": 0,
-        }
-        mock_storage_port.get_bot_config.return_value = existing_bot_data
+        storage_port.bots[1] = make_bot_data(name="Old Bot")
 
         # Act
         updated_bot = await use_case.update_bot(1, valid_bot_config)
@@ -226,167 +262,52 @@ class TestBotManagementUseCase:
         # Assert
         assert updated_bot is not None
         assert updated_bot.config.name == "Test Bot"
-        mock_storage_port.update_bot_config.assert_called_once_with(1, updated_bot.to_dict())
+        assert storage_port.calls_of("update_bot_config") == [(1, updated_bot.to_dict())]
 
-    @pytest.mark.asyncio
-    async def test_update_bot_not_found(self, use_case, valid_bot_config, mock_storage_port):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_update_bot_not_found(self, use_case, valid_bot_config):
         """Test updating non-existent bot."""
-        # Arrange
-        mock_storage_port.get_bot_config.return_value = None
-
         # Act & Assert
         with pytest.raises(ValueError, match="Bot 999 not found"):
             await use_case.update_bot(999, valid_bot_config)
 
-    def test_delete_bot_success(self, use_case, mock_storage_port):
-        """Test successful bot deletion."""
+    @pytest.mark.parametrize(
+        "action,initial_status,storage_method",
+        [
+            ("delete_bot", "stopped", "delete_bot_config"),
+            ("start_bot", "stopped", "update_bot_config"),
+            ("stop_bot", "running", "update_bot_config"),
+        ],
+    )
+    def test_bot_action_success(
+        self, use_case, storage_port, action, initial_status, storage_method
+    ):
+        """Test successful bot deletion, start and stop."""
         # Arrange
-        existing_bot_data = {
-            "config": {
-                "name": "Test Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "stopped",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 0,
-            "voice_message_count": 0,
-        }
-        mock_storage_port.get_bot_config.return_value = existing_bot_data
+        storage_port.bots[1] = make_bot_data(status=initial_status)
 
         # Act
-        success = use_case.delete_bot(1)
+        success = getattr(use_case, action)(1)
 
         # Assert
         assert success is True
-        mock_storage_port.delete_bot_config.assert_called_once_with(1)
+        assert [args[0] for args in storage_port.calls_of(storage_method)] == [1]
 
-    def test_delete_bot_not_found(self, use_case, mock_storage_port):
+    def test_delete_bot_not_found(self, use_case):
         """Test deleting non-existent bot."""
-        # Arrange
-        mock_storage_port.get_bot_config.return_value = None
-
         # Act
         success = use_case.delete_bot(999)
 
         # Assert
         assert success is False
 
-    def test_start_bot_success(self, use_case, mock_storage_port):
-        """Test successful bot start."""
-        # Arrange
-        existing_bot_data = {
-            "config": {
-                "name": "Test Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "stopped",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 0,
-            "voice_message_count": 0,
-        }
-        mock_storage_port.get_bot_config.return_value = existing_bot_data
-
-        # Act
-        success = use_case.start_bot(1)
-
-        # Assert
-        assert success is True
-        mock_storage_port.update_bot_config.assert_called_once()
-
-    def test_stop_bot_success(self, use_case, mock_storage_port):
-        """Test successful bot stop."""
-        # Arrange
-        existing_bot_data = {
-            "config": {
-                "name": "Test Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "running",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 10,
-            "voice_message_count": 2,
-        }
-        mock_storage_port.get_bot_config.return_value = existing_bot_data
-
-        # Act
-        success = use_case.stop_bot(1)
-
-        # Assert
-        assert success is True
-        mock_storage_port.update_bot_config.assert_called_once()
-
-    def test_restart_bot_success(self, use_case, mock_storage_port):
+    def test_restart_bot_success(self, use_case, storage_port):
         """Test successful bot restart."""
         # Arrange
-        # First call returns running bot, second call returns stopped bot
-        running_bot_data = {
-            "config": {
-                "name": "Test Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "running",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 10,
-            "voice_message_count": 2,
-        }
-        stopped_bot_data = {
-            "config": {
-                "name": "Test Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "stopped",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 10,
-            "voice_message_count": 2,
-        }
-        
-        # Configure mock to return different data on subsequent calls
-        mock_storage_port.get_bot_config.side_effect = [running_bot_data, stopped_bot_data]
+        # stop_bot saves the stopped bot, start_bot then reads it back from the fake storage
+        storage_port.bots[1] = make_bot_data(
+            status="running", message_count=10, voice_message_count=2
+        )
 
         # Act
         success = use_case.restart_bot(1)
@@ -394,32 +315,15 @@ class TestBotManagementUseCase:
         # Assert
         assert success is True
         # Should be called twice: once for stop, once for start
-        assert mock_storage_port.update_bot_config.call_count == 2
+        assert len(storage_port.calls_of("update_bot_config")) == 2
 
-    @pytest.mark.asyncio
-    async def test_get_bot_status_success(self, use_case, mock_storage_port, mock_telegram_port):
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_get_bot_status_success(self, use_case, storage_port):
         """Test getting bot status."""
         # Arrange
-        existing_bot_data = {
-            "config": {
-                "name": "Test Bot",
-                "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                "group_context_limit": 15,
-                "enable_ai_responses": True,
-                "enable_voice_responses": False,
-                "voice_model": "tts-1",
-                "voice_type": "alloy",
-            },
-            "status": "running",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "last_error": None,
-            "message_count": 10,
-            "voice_message_count": 2,
-        }
-        mock_storage_port.get_bot_config.return_value = existing_bot_data
+        storage_port.bots[1] = make_bot_data(
+            status="running", message_count=10, voice_message_count=2
+        )
 
         # Act
         status = await use_case.get_bot_status(1)
@@ -433,132 +337,29 @@ class TestBotManagementUseCase:
         assert status["voice_message_count"] == 2
         assert status["telegram_info"] is not None
 
-    def test_get_running_bots(self, use_case, mock_storage_port):
-        """Test getting running bots."""
-        # Arrange
-        bots_data = {
-            1: {
-                "config": {
-                    "name": "Bot 1",
-                    "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                    "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "group_context_limit": 15,
-                    "enable_ai_responses": True,
-                    "enable_voice_responses": False,
-                    "voice_model": "tts-1",
-                    "voice_type": "alloy",
-                },
-                "status": "running",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "last_error": None,
-                "message_count": 10,
-                "voice_message_count": 2,
-            },
-            2: {
-                "config": {
-                    "name": "Bot 2",
-                    "telegram_token": "5123456789:DEFdefGHIjklMNOpqrsTUVwxyz",
-                    "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "group_context_limit": 15,
-                    "enable_ai_responses": True,
-                    "enable_voice_responses": False,
-                    "voice_model": "tts-1",
-                    "voice_type": "alloy",
-                },
-                "status": "stopped",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "last_error": None,
-                "message_count": 5,
-                "voice_message_count": 0,
-            }
-        }
-        mock_storage_port.get_all_bot_configs.return_value = bots_data
-
-        # Act
-        running_bots = use_case.get_running_bots()
-
-        # Assert
-        assert len(running_bots) == 1
-        assert running_bots[0].id == 1
-        assert running_bots[0].status == BotStatus.RUNNING
-
-    def test_get_stopped_bots(self, use_case, mock_storage_port):
-        """Test getting stopped bots."""
-        # Arrange
-        bots_data = {
-            1: {
-                "config": {
-                    "name": "Bot 1",
-                    "telegram_token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                    "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "group_context_limit": 15,
-                    "enable_ai_responses": True,
-                    "enable_voice_responses": False,
-                    "voice_model": "tts-1",
-                    "voice_type": "alloy",
-                },
-                "status": "running",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "last_error": None,
-                "message_count": 10,
-                "voice_message_count": 2,
-            },
-            2: {
-                "config": {
-                    "name": "Bot 2",
-                    "telegram_token": "5123456789:DEFdefGHIjklMNOpqrsTUVwxyz",
-                    "openai_api_key": "sk-test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "assistant_id": "asst_test1234567890abcdefghijklmnopqrstuvwxyz",
-                    "group_context_limit": 15,
-                    "enable_ai_responses": True,
-                    "enable_voice_responses": False,
-                    "voice_model": "tts-1",
-                    "voice_type": "alloy",
-                },
-                "status": "stopped",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "last_error": None,
-                "message_count": 5,
-                "voice_message_count": 0,
-            }
-        }
-        mock_storage_port.get_all_bot_configs.return_value = bots_data
-
-        # Act
-        stopped_bots = use_case.get_stopped_bots()
-
-        # Assert
-        assert len(stopped_bots) == 1
-        assert stopped_bots[0].id == 2
-        assert stopped_bots[0].status == BotStatus.STOPPED
-
-    def test_get_bot_count(self, use_case, mock_storage_port):
+    def test_get_bot_count(self, use_case, storage_port):
         """Test getting bot count."""
         # Arrange
-        mock_storage_port.get_bot_count.return_value = 5
+        storage_port.bots.update({bot_id: make_bot_data() for bot_id in range(1, 6)})
 
         # Act
         count = use_case.get_bot_count()
 
         # Assert
         assert count == 5
-        mock_storage_port.get_bot_count.assert_called_once()
+        assert storage_port.calls_of("get_bot_count") == [()]
 
-    def test_get_running_bot_count(self, use_case, mock_storage_port):
+    def test_get_running_bot_count(self, use_case, storage_port):
         """Test getting running bot count."""
         # Arrange
-        mock_storage_port.get_running_bot_count.return_value = 3
+        storage_port.bots.update(
+            {bot_id: make_bot_data(status="running") for bot_id in range(1, 4)}
+        )
+        storage_port.bots[4] = make_bot_data()
 
         # Act
         count = use_case.get_running_bot_count()
 
         # Assert
         assert count == 3
-        mock_storage_port.get_running_bot_count.assert_called_once()
+        assert storage_port.calls_of("get_running_bot_count") == [()]
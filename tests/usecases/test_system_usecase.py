@@ -5,6 +5,8 @@ This module contains tests for the system use case
 that orchestrates system configuration and external adapters.
 """
 
+import copy
+
 import pytest
 from unittest.mock import Mock, AsyncMock
 from datetime import datetime
@@ -13,84 +15,183 @@ from core.usecases.system import SystemUseCase
 from core.domain.config import SystemConfig, AdminBotConfig
 
 
+# Fixed timestamp for port data (tests never inspect it)
+_TIMESTAMP = datetime(2024, 1, 1).isoformat()
+
+# Default return values of the ports, deep-copied into the ports before every test
+# (the use case mutates the admin users and notifications it reads back)
+STORAGE_PORT_DEFAULTS = {
+    "read_config": {
+        "version": "3.6.0",
+        "debug_mode": False,
+        "log_level": "INFO",
+        "max_bots": 100,
+        "auto_update_enabled": True,
+        "backup_retention_days": 30,
+        "admin_bot": {
+            "enabled": False,
+            "token": "",
+            "admin_users": [],
+            "notifications": {
+                "bot_status": True,
+                "high_cpu": True,
+                "errors": True,
+                "weekly_stats": True,
+            },
+        },
+        "created_at": _TIMESTAMP,
+        "updated_at": _TIMESTAMP,
+    },
+}
+# Stored config with the admin bot enabled for two admins (deep-copy before use)
+ADMIN_ENABLED_CONFIG = {
+    "admin_bot": {
+        "enabled": True,
+        "token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
+        "admin_users": [123456789, 987654321],
+        "notifications": {
+            "bot_status": True,
+            "high_cpu": True,
+            "errors": True,
+            "weekly_stats": True,
+        },
+    },
+}
+VERSION_INFO = {
+    "version": "3.6.0",
+    "commit_hash": "abc123",
+    "branch": "main",
+    "git_status": "clean",
+    "build_date": _TIMESTAMP,
+}
+UPDATER_PORT_DEFAULTS = {
+    "check_updates": {
+        "has_updates": False,
+        "current_version": "abc123",
+        "available_version": "abc123",
+        "version_info": VERSION_INFO,
+    },
+    "apply_update": True,
+    "create_backup": "backup_20240101_120000",
+    "restore_backup": True,
+    "get_update_status": {
+        "status": "idle",
+        "last_check": _TIMESTAMP,
+        "current_version": "abc123",
+        "available_version": "abc123",
+        "backup_id": None,
+    },
+    "list_backups": [],
+    "cleanup_old_backups": {"deleted_count": 0, "kept_count": 5, "total_size_freed": 0},
+    "get_version_info": VERSION_INFO,
+    "validate_update": True,
+    "rollback_update": True,
+}
+
+
+@pytest.fixture(scope="module")
+def mock_storage_port():
+    """Create mock storage port (shared by the module, reset before each test)."""
+    return Mock()
+
+
+class FakeUpdaterPort:
+    """Updater port returning canned results from ``results`` (by method name).
+
+    Every call is recorded in ``calls`` as ``(method_name, *args)``.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self.calls = []
+        self.reset()
+
+    def reset(self):
+        """Restore fresh default results and forget recorded calls."""
+        self.results = copy.deepcopy(UPDATER_PORT_DEFAULTS)
+        self.calls.clear()
+
+    def calls_of(self, name):
+        """Arguments of every recorded call to ``name``."""
+        return [call[1:] for call in self.calls if call[0] == name]
+
+    def _call(self, name, *args):
+        self.calls.append((name, *args))
+        return self.results[name]
+
+    def check_updates(self):
+        return self._call("check_updates")
+
+    def apply_update(self, version):
+        return self._call("apply_update", version)
+
+    def create_backup(self):
+        return self._call("create_backup")
+
+    def restore_backup(self, backup_id):
+        return self._call("restore_backup", backup_id)
+
+    def get_update_status(self):
+        return self._call("get_update_status")
+
+    def list_backups(self):
+        return self._call("list_backups")
+
+    def cleanup_old_backups(self, keep_count=5):
+        return self._call("cleanup_old_backups", keep_count)
+
+    def get_version_info(self):
+        return self._call("get_version_info")
+
+    def validate_update(self, version):
+        return self._call("validate_update", version)
+
+    def rollback_update(self):
+        return self._call("rollback_update")
+
+
+@pytest.fixture(scope="module")
+def updater_port():
+    """Create fake updater port (shared by the module, reset before each test)."""
+    return FakeUpdaterPort()
+
+
+@pytest.fixture(scope="module")
+def use_case(mock_storage_port, updater_port):
+    """Create use case instance."""
+    return SystemUseCase(mock_storage_port, updater_port)
+
+
+@pytest.fixture(scope="module")
+def invalid_system_config():
+    """Create invalid system configuration (shared: tests only read it)."""
+    return SystemConfig(
+        version="",  # Invalid: empty version
+        max_bots=0,  # Invalid: non-positive
+        backup_retention_days=0,  # Invalid: non-positive
+    )
+
+
+@pytest.fixture(scope="module")
+def invalid_admin_bot_config():
+    """Create invalid enabled admin bot configuration (shared: tests only read it)."""
+    return AdminBotConfig(
+        enabled=True,
+        token="",  # Invalid: empty token when enabled
+        admin_users=[],  # Invalid: no admin users when enabled
+    )
+
+
 class TestSystemUseCase:
     """Test SystemUseCase."""
 
-    @pytest.fixture
-    def mock_storage_port(self):
-        """Create mock storage port."""
-        mock = Mock()
-        mock.read_config = Mock(return_value={
-            "version": "3.6.0",
-            "debug_mode": False,
-            "log_level": "INFO",
-            "max_bots": 100,
-            "auto_update_enabled": True,
-            "backup_retention_days": 30,
-            "admin_bot": {
-                "enabled": False,
-                "token": "",
-                "admin_users": [],
-                "notifications": {
-                    "bot_status": True,
-                    "high_cpu": True,
-                    "errors": True,
-                    "weekly_stats": True,
-                }
-            },
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-        })
-        mock.write_config = Mock()
-        return mock
-
-    @pytest.fixture
-    def mock_updater_port(self):
-        """Create mock updater port."""
-        mock = Mock()
-        mock.check_updates = Mock(return_value={
-            "has_updates": False,
-            "current_version": "abc123",
-            "available_version": "abc123",
-            "version_info": {
-                "version": "3.6.0",
-                "commit_hash": "abc123",
-                "branch": "main",
-                "git_status": "clean",
-                "build_date": datetime.now().isoformat(),
-            }
-        })
-        mock.apply_update = Mock(return_value=True)
-        mock.create_backup = Mock(return_value="backup_20240101_120000")
-        mock.restore_backup = Mock(return_value=True)
-        mock.get_update_status = Mock(return_value={
-            "status": "idle",
-            "last_check": datetime.now().isoformat(),
-            "current_version": "abc123",
-            "available_version": "abc123",
-            "backup_id": None,
-        })
-        mock.list_backups = Mock(return_value=[])
-        mock.cleanup_old_backups = Mock(return_value={
-            "deleted_count": 0,
-            "kept_count": 5,
-            "total_size_freed": 0
-        })
-        mock.get_version_info = Mock(return_value={
-            "version": "3.6.0",
-            "commit_hash": "abc123",
-            "branch": "main",
-            "git_status": "clean",
-            "build_date": datetime.now().isoformat(),
-        })
-        mock.validate_update = Mock(return_value=True)
-        mock.rollback_update = Mock(return_value=True)
-        return mock
-
-    @pytest.fixture
-    def use_case(self, mock_storage_port, mock_updater_port):
-        """Create use case instance."""
-        return SystemUseCase(mock_storage_port, mock_updater_port)
+    @pytest.fixture(autouse=True)
+    def _reset_ports(self, mock_storage_port, updater_port):
+        """Clear calls and per-test overrides, then restore fresh default return values."""
+        mock_storage_port.reset_mock(return_value=True, side_effect=True)
+        for name, value in STORAGE_PORT_DEFAULTS.items():
+            getattr(mock_storage_port, name).return_value = copy.deepcopy(value)
+        updater_port.reset()
 
     def test_get_system_config(self, use_case, mock_storage_port):
         """Test getting system configuration."""
@@ -132,18 +233,11 @@ class TestSystemUseCase:
         assert call_args["auto_update_enabled"] is False
         assert call_args["backup_retention_days"] == 60
 
-    def test_update_system_config_invalid(self, use_case):
+    def test_update_system_config_invalid(self, use_case, invalid_system_config):
         """Test updating system configuration with invalid data."""
-        # Arrange
-        invalid_config = SystemConfig(
-            version="",  # Invalid: empty version
-            max_bots=0,  # Invalid: non-positive
-            backup_retention_days=0,  # Invalid: non-positive
-        )
-
         # Act & Assert
         with pytest.raises(ValueError, match="Invalid system configuration"):
-            use_case.update_system_config(invalid_config)
+            use_case.update_system_config(invalid_system_config)
 
     def test_get_admin_bot_config(self, use_case, mock_storage_port):
         """Test getting admin bot configuration."""
@@ -190,91 +284,48 @@ class TestSystemUseCase:
         assert admin_bot_config["notifications"]["errors"] is True
         assert admin_bot_config["notifications"]["weekly_stats"] is False
 
-    def test_update_admin_bot_config_invalid(self, use_case):
+    def test_update_admin_bot_config_invalid(self, use_case, invalid_admin_bot_config):
         """Test updating admin bot configuration with invalid data."""
-        # Arrange
-        invalid_admin_config = AdminBotConfig(
-            enabled=True,
-            token="",  # Invalid: empty token when enabled
-            admin_users=[],  # Invalid: no admin users when enabled
-        )
-
         # Act & Assert
         with pytest.raises(ValueError, match="Invalid admin bot configuration"):
-            use_case.update_admin_bot_config(invalid_admin_config)
-
-    def test_check_updates(self, use_case, mock_updater_port):
-        """Test checking for system updates."""
-        # Act
-        update_info = use_case.check_updates()
-
-        # Assert
-        assert update_info is not None
-        assert update_info["has_updates"] is False
-        assert update_info["current_version"] == "abc123"
-        assert update_info["available_version"] == "abc123"
-        assert "version_info" in update_info
-        mock_updater_port.check_updates.assert_called_once()
-
-    def test_apply_update(self, use_case, mock_updater_port):
-        """Test applying system update."""
-        # Arrange
-        version = "def456"
-
-        # Act
-        success = use_case.apply_update(version)
-
-        # Assert
-        assert success is True
-        mock_updater_port.apply_update.assert_called_once_with(version)
-
-    def test_create_backup(self, use_case, mock_updater_port):
-        """Test creating system backup."""
-        # Act
-        backup_id = use_case.create_backup()
-
-        # Assert
-        assert backup_id == "backup_20240101_120000"
-        mock_updater_port.create_backup.assert_called_once()
-
-    def test_restore_backup(self, use_case, mock_updater_port):
-        """Test restoring system backup."""
-        # Arrange
-        backup_id = "backup_20240101_120000"
-
+            use_case.update_admin_bot_config(invalid_admin_bot_config)
+
+    @pytest.mark.parametrize(
+        "method,args",
+        [
+            ("check_updates", ()),
+            ("apply_update", ("def456",)),
+            ("create_backup", ()),
+            ("restore_backup", ("backup_20240101_120000",)),
+            ("get_update_status", ()),
+            ("cleanup_old_backups", (3,)),
+            ("get_version_info", ()),
+            ("validate_update", ("def456",)),
+            ("rollback_update", ()),
+        ],
+    )
+    def test_updater_pass_through(self, use_case, updater_port, method, args):
+        """Test update and backup operations that return the updater port result unchanged."""
         # Act
-        success = use_case.restore_backup(backup_id)
+        result = getattr(use_case, method)(*args)
 
         # Assert
-        assert success is True
-        mock_updater_port.restore_backup.assert_called_once_with(backup_id)
+        assert result == UPDATER_PORT_DEFAULTS[method]
+        assert updater_port.calls_of(method) == [args]
 
-    def test_get_update_status(self, use_case, mock_updater_port):
-        """Test getting update status."""
-        # Act
-        status = use_case.get_update_status()
-
-        # Assert
-        assert status is not None
-        assert status["status"] == "idle"
-        assert "last_check" in status
-        assert status["current_version"] == "abc123"
-        assert status["available_version"] == "abc123"
-        mock_updater_port.get_update_status.assert_called_once()
-
-    def test_list_backups(self, use_case, mock_updater_port):
+    def test_list_backups(self, use_case, updater_port):
         """Test listing system backups."""
         # Arrange
         mock_backups = [
             {
                 "id": "backup_20240101_120000",
-                "created_at": datetime.now(),
+                "created_at": datetime(2024, 1, 1, 12, 0),
                 "commit": "abc123",
                 "branch": "main",
                 "status": "clean",
             }
         ]
-        mock_updater_port.list_backups.return_value = mock_backups
+        updater_port.results["list_backups"] = mock_backups
 
         # Act
         backups = use_case.list_backups()
@@ -282,57 +333,7 @@ class TestSystemUseCase:
         # Assert
         assert len(backups) == 1
         assert backups[0]["id"] == "backup_20240101_120000"
-        mock_updater_port.list_backups.assert_called_once()
-
-    def test_cleanup_old_backups(self, use_case, mock_updater_port):
-        """Test cleaning up old backups."""
-        # Arrange
-        keep_count = 3
-
-        # Act
-        result = use_case.cleanup_old_backups(keep_count)
-
-        # Assert
-        assert result is not None
-        assert result["deleted_count"] == 0
-        assert result["kept_count"] == 5
-        assert result["total_size_freed"] == 0
-        mock_updater_port.cleanup_old_backups.assert_called_once_with(keep_count)
-
-    def test_get_version_info(self, use_case, mock_updater_port):
-        """Test getting version information."""
-        # Act
-        version_info = use_case.get_version_info()
-
-        # Assert
-        assert version_info is not None
-        assert version_info["version"] == "3.6.0"
-        assert version_info["commit_hash"] == "abc123"
-        assert version_info["branch"] == "main"
-        assert version_info["git_status"] == "clean"
-        assert "build_date" in version_info
-        mock_updater_port.get_version_info.assert_called_once()
-
-    def test_validate_update(self, use_case, mock_updater_port):
-        """Test validating update."""
-        # Arrange
-        version = "def456"
-
-        # Act
-        is_valid = use_case.validate_update(version)
-
-        # Assert
-        assert is_valid is True
-        mock_updater_port.validate_update.assert_called_once_with(version)
-
-    def test_rollback_update(self, use_case, mock_updater_port):
-        """Test rolling back update."""
-        # Act
-        success = use_case.rollback_update()
-
-        # Assert
-        assert success is True
-        mock_updater_port.rollback_update.assert_called_once()
+        assert updater_port.calls_of("list_backups") == [()]
 
     def test_get_system_stats(self, use_case, mock_storage_port):
         """Test getting system statistics."""
@@ -355,19 +356,7 @@ class TestSystemUseCase:
     def test_is_admin_user(self, use_case, mock_storage_port):
         """Test checking if user is admin."""
         # Arrange
-        mock_storage_port.read_config.return_value = {
-            "admin_bot": {
-                "enabled": True,
-                "token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "admin_users": [123456789, 987654321],
-                "notifications": {
-                    "bot_status": True,
-                    "high_cpu": True,
-                    "errors": True,
-                    "weekly_stats": True,
-                }
-            }
-        }
+        mock_storage_port.read_config.return_value = copy.deepcopy(ADMIN_ENABLED_CONFIG)
 
         # Act & Assert
         assert use_case.is_admin_user(123456789) is True
@@ -391,19 +380,7 @@ class TestSystemUseCase:
     def test_remove_admin_user(self, use_case, mock_storage_port):
         """Test removing admin user."""
         # Arrange
-        mock_storage_port.read_config.return_value = {
-            "admin_bot": {
-                "enabled": True,
-                "token": "5123456789:ABCdefGHIjklMNOpqrsTUVwxyz",
-                "admin_users": [123456789, 987654321],
-                "notifications": {
-                    "bot_status": True,
-                    "high_cpu": True,
-                    "errors": True,
-                    "weekly_stats": True,
-                }
-            }
-        }
+        mock_storage_port.read_config.return_value = copy.deepcopy(ADMIN_ENABLED_CONFIG)
         user_id = 123456789
 
         # Act
@@ -450,7 +427,7 @@ class TestSystemUseCase:
         assert notifications["errors"] is True
         assert notifications["weekly_stats"] is False
 
-    def test_system_config_validation(self, use_case):
+    def test_system_config_validation(self, invalid_system_config):
         """Test system configuration validation."""
         # Test valid config
         valid_config = SystemConfig(
@@ -462,18 +439,14 @@ class TestSystemUseCase:
         assert len(errors) == 0
 
         # Test invalid config
-        invalid_config = SystemConfig(
-            version="",  # Invalid: empty version
-            max_bots=0,  # Invalid: non-positive
-            backup_retention_days=0,  # Invalid: non-positive
-        )
-        errors = invalid_config.validate()
+        errors = invalid_system_config.validate()
         assert len(errors) > 0
-        assert any("System version is required" in error for error in errors)
-        assert any("Maximum bots must be positive" in error for error in errors)
-        assert any("Backup retention days must be positive" in error for error in errors)
+        errors_text = "\n".join(errors)
+        assert "System version is required" in errors_text
+        assert "Maximum bots must be positive" in errors_text
+        assert "Backup retention days must be positive" in errors_text
 
-    def test_admin_bot_config_validation(self, use_case):
+    def test_admin_bot_config_validation(self, invalid_admin_bot_config):
         """Test admin bot configuration validation."""
         # Test valid config
         valid_config = AdminBotConfig(
@@ -485,15 +458,11 @@ class TestSystemUseCase:
         assert len(errors) == 0
 
         # Test invalid enabled config
-        invalid_config = AdminBotConfig(
-            enabled=True,
-            token="",  # Invalid: empty token when enabled
-            admin_users=[],  # Invalid: no admin users when enabled
-        )
-        errors = invalid_config.validate()
+        errors = invalid_admin_bot_config.validate()
         assert len(errors) > 0
-        assert any("Admin bot token is required when enabled" in error for error in errors)
-        assert any("At least one admin user is required when enabled" in error for error in errors)
+        errors_text = "\n".join(errors)
+        assert "Admin bot token is required when enabled" in errors_text
+        assert "At least one admin user is required when enabled" in errors_text
 
         # Test invalid token format
         invalid_token_config = AdminBotConfig(
@@ -503,7 +472,7 @@ class TestSystemUseCase:
         )
         errors = invalid_token_config.validate()
         assert len(errors) > 0
-        assert any("Invalid admin bot token format" in error for error in errors)
+        assert "Invalid admin bot token format" in "\n".join(errors)
 
 
 
@@ -2,49 +2,85 @@
 Утилиты для тестирования
 """
 
+import contextlib
+import functools
 import json
 import logging
+import os
+import re
+import threading
 import time
 from typing import Any
 
 import requests
 
-# Настройка логирования для тестов
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(asctime)s] %(levelname)s: %(message)s",
-    handlers=[logging.FileHandler("tests/test.log"), logging.StreamHandler()],
-)
+# Настройка логирования для тестов: по умолчанию только предупреждения и ошибки,
+# с TEST_LOG_FILE=<путь> (например, tests/test.log) подробный лог ещё и пишется в файл.
+# Настраивается логгер модуля, а не корневой: под pytest у корневого логгера уже есть
+# обработчики и logging.basicConfig ничего не делает. Проверка handlers защищает от
+# повторного добавления обработчиков при повторном импорте.
 logger = logging.getLogger(__name__)
+if not logger.handlers:
+    _log_file = os.getenv("TEST_LOG_FILE")
+    _formatter = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s")
+    _handlers = [logging.StreamHandler()]
+    if _log_file:
+        _handlers.append(logging.FileHandler(_log_file))
+    for _handler in _handlers:
+        _handler.setFormatter(_formatter)
+        logger.addHandler(_handler)
+    logger.setLevel(logging.INFO if _log_file else logging.WARNING)
+
+# Отметка «JSON ещё не разобран» (сам JSON может быть null)
+_NOT_PARSED = object()
+
+
+def _response_json(response: requests.Response):
+    """JSON из тела ответа
+
+    json.loads сам определяет UTF-8/16/32 по байтам, поэтому, в отличие от response.json(),
+    кодировка текста ответа не угадывается. Результат запоминается на ответе, так что
+    несколько проверок одного ответа (validate_response, assert_*) разбирают его один раз.
+    Невалидное тело дает ValueError: json.JSONDecodeError или UnicodeDecodeError для байтов
+    не в UTF-8/16/32.
+    """
+    data = getattr(response, "_cached_json", _NOT_PARSED)
+    if data is _NOT_PARSED:
+        data = json.loads(response.content)
+        response._cached_json = data
+    return data
 
 
 class TestLogger:
-    """Логгер для тестов"""
+    """Логгер для тестов
+
+    Сообщение передаётся аргументом, поэтому отфильтрованные по уровню записи не форматируются.
+    """
 
     @staticmethod
     def info(message: str):
         """Информационное сообщение"""
-        logger.info(f"ℹ️ {message}")
+        logger.info("ℹ️ %s", message)
 
     @staticmethod
     def success(message: str):
         """Успешное выполнение"""
-        logger.info(f"✅ {message}")
+        logger.info("✅ %s", message)
 
     @staticmethod
     def error(message: str):
         """Ошибка"""
-        logger.error(f"❌ {message}")
+        logger.error("❌ %s", message)
 
     @staticmethod
     def warning(message: str):
         """Предупреждение"""
-        logger.warning(f"⚠️ {message}")
+        logger.warning("⚠️ %s", message)
 
     @staticmethod
     def debug(message: str):
         """Отладочная информация"""
-        logger.debug(f"🔍 {message}")
+        logger.debug("🔍 %s", message)
 
 
 class TestHelper:
@@ -52,12 +88,18 @@ class TestHelper:
 
     @staticmethod
     def wait_for_element(condition_func, timeout: int = 10, interval: float = 0.5):
-        """Ожидание выполнения условия"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
+        """Ожидание выполнения условия
+
+        Пауза между проверками растёт экспоненциально от 1 мс до interval, поэтому
+        быстро выполняющееся условие не ждёт полный interval.
+        """
+        deadline = time.monotonic() + timeout
+        delay = 0.001
+        while time.monotonic() < deadline:
             if condition_func():
                 return True
-            time.sleep(interval)
+            time.sleep(delay)
+            delay = min(delay * 2, interval)
         return False
 
     @staticmethod
@@ -86,9 +128,9 @@ class TestHelper:
             return False
 
         try:
-            response.json()  # Проверяем, что ответ - валидный JSON
+            _response_json(response)  # Проверяем, что ответ - валидный JSON
             return True
-        except json.JSONDecodeError:
+        except ValueError:
             TestLogger.error("Ответ не является валидным JSON")
             return False
 
@@ -96,35 +138,62 @@ class TestHelper:
     def extract_bot_id_from_response(response: requests.Response) -> int | None:
         """Извлечение ID бота из ответа"""
         try:
-            data = response.json()
+            data = _response_json(response)
             if isinstance(data, dict):
                 # Пробуем разные варианты структуры ответа
                 bot_id = data.get("bot_id") or data.get("data", {}).get("bot_id") or data.get("id")
                 return int(bot_id) if bot_id else None
-        except (json.JSONDecodeError, ValueError, TypeError):
+        except (ValueError, TypeError):
             pass
         return None
 
 
+class Measurement:
+    """Результат одного замера performance_monitor.measure()"""
+
+    def __init__(self):
+        self.duration = 0.0
+
+    def is_within_limit(self, limit: float) -> bool:
+        """Проверка, что время выполнения в пределах лимита"""
+        return self.duration <= limit
+
+
 class PerformanceMonitor:
-    """Мониторинг производительности"""
+    """Мониторинг производительности
+
+    Предпочтительно использовать measure(); start()/stop() хранят таймер
+    отдельно для каждого потока, поэтому параллельные замеры не мешают друг другу.
+    """
 
     def __init__(self):
-        self.start_time = None
-        self.end_time = None
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def measure(self):
+        """Замер блока кода: with performance_monitor.measure() as m: ...; m.duration"""
+        measurement = Measurement()
+        start_ns = time.perf_counter_ns()
+        try:
+            yield measurement
+        finally:
+            measurement.duration = (time.perf_counter_ns() - start_ns) / 1e9
 
     def start(self):
         """Начало измерения"""
-        self.start_time = time.time()
+        self._local.start_ns = time.perf_counter_ns()
+        self._local.end_ns = None
 
     def stop(self):
         """Окончание измерения"""
-        self.end_time = time.time()
+        self._local.end_ns = time.perf_counter_ns()
 
     def get_duration(self) -> float:
         """Получение длительности в секундах"""
-        if self.start_time and self.end_time:
-            return self.end_time - self.start_time
+        start_ns = getattr(self._local, "start_ns", None)
+        end_ns = getattr(self._local, "end_ns", None)
+        if start_ns is not None and end_ns is not None:
+            return (end_ns - start_ns) / 1e9
         return 0.0
 
     def is_within_limit(self, limit: float) -> bool:
@@ -133,23 +202,30 @@ class PerformanceMonitor:
         return duration <= limit
 
 
+# Неизменяемая часть конфигурации бота из generate_bot_config (только скалярные значения)
+_BOT_CONFIG_TEMPLATE = {
+    "group_context_limit": 15,
+    "enable_voice_responses": False,
+    "enable_ai_responses": True,
+}
+
+
 class TestDataGenerator:
     """Генератор тестовых данных"""
 
     @staticmethod
     def generate_bot_config(bot_name: str = None) -> dict[str, Any]:
         """Генерация конфигурации бота"""
+        timestamp = int(time.time())
         if not bot_name:
-            bot_name = f"TestBot_{int(time.time())}"
+            bot_name = f"TestBot_{timestamp}"
 
         return {
+            **_BOT_CONFIG_TEMPLATE,
             "bot_name": bot_name,
-            "telegram_token": f"1234567890:ABCdefGHIjklMNOpqrsTUVwxyz_{int(time.time())}",
-            "openai_api_key": f"sk-test1234567890abcdefghijklmnopqrstuvwxyz_{int(time.time())}",
-            "assistant_id": f"asst_test1234567890abcdefghijklmnopqrstuvwxyz_{int(time.time())}",
-            "group_context_limit": 15,
-            "enable_voice_responses": False,
-            "enable_ai_responses": True,
+            "telegram_token": f"1234567890:ABCdefGHIjklMNOpqrsTUVwxyz_{timestamp}",
+            "openai_api_key": f"sk-test1234567890abcdefghijklmnopqrstuvwxyz_{timestamp}",
+            "assistant_id": f"asst_test1234567890abcdefghijklmnopqrstuvwxyz_{timestamp}",
             "marketplace": {
                 "enabled": True,
                 "title": bot_name,
@@ -186,38 +262,119 @@ class AssertionHelper:
     def assert_response_structure(response: requests.Response, required_fields: list):
         """Проверка структуры ответа"""
         try:
-            data = response.json()
-            for field in required_fields:
-                assert field in data, f"Поле '{field}' отсутствует в ответе"
-        except json.JSONDecodeError:
+            data = _response_json(response)
+            missing = [field for field in required_fields if field not in data]
+            assert not missing, f"Поля отсутствуют в ответе: {missing}"
+        except ValueError:
             assert False, "Ответ не является валидным JSON"
 
+    @staticmethod
+    def assert_html_page(response: requests.Response, keyword_groups: list):
+        """Проверка HTML страницы: в тексте есть хотя бы одно слово из каждой группы"""
+        content_type = response.headers.get("content-type", "")
+        assert "text/html" in content_type, f"Ожидался HTML, получен {content_type}"
+
+        content = response.text.lower()
+        for keywords in keyword_groups:
+            assert any(
+                keyword in content for keyword in keywords
+            ), f"На странице не найдено ни одного из: {keywords}"
+
     @staticmethod
     def assert_bot_status(response: requests.Response, expected_status: str):
         """Проверка статуса бота"""
         try:
-            data = response.json()
+            data = _response_json(response)
             actual_status = data.get("status", data.get("data", {}).get("status"))
             assert (
                 actual_status == expected_status
             ), f"Статус бота: {actual_status}, ожидался: {expected_status}"
-        except json.JSONDecodeError:
+        except ValueError:
             assert False, "Ответ не является валидным JSON"
 
     @staticmethod
     def assert_marketplace_bot(response: requests.Response, expected_enabled: bool = True):
         """Проверка бота в маркетплейсе"""
         try:
-            data = response.json()
+            data = _response_json(response)
             marketplace_data = data.get("marketplace", {})
             actual_enabled = marketplace_data.get("enabled", False)
             assert (
                 actual_enabled == expected_enabled
             ), f"Маркетплейс: {actual_enabled}, ожидался: {expected_enabled}"
-        except json.JSONDecodeError:
+        except ValueError:
             assert False, "Ответ не является валидным JSON"
 
 
+@functools.lru_cache(maxsize=None)
+def _needles_matcher(needles: tuple) -> tuple:
+    """Регулярное выражение на набор подстрок и подстроки-префиксы каждой из них
+
+    Группа внутри опережающей проверки (?=(...)) совпадает в каждой позиции текста, поэтому
+    перекрывающиеся вхождения не теряются. В позиции берётся самая длинная подстрока
+    (длинные идут первыми), а более короткие, начинающиеся там же, являются её префиксами.
+    """
+    ordered = sorted(set(needles), key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    prefixes = {
+        needle: frozenset(other for other in ordered if needle.startswith(other))
+        for needle in ordered
+    }
+    return pattern, prefixes
+
+
+def _found_needles(matcher: tuple, text: str) -> set:
+    """Все подстроки набора, входящие в text, за один проход по тексту"""
+    pattern, prefixes = matcher
+    found = set()
+    for match in set(pattern.findall(text)):
+        found |= prefixes[match]
+    return found
+
+
+def find_missing(haystack: str, needles) -> list:
+    """Подстроки из needles, отсутствующие в haystack, за один проход по тексту"""
+    needles = tuple(needles)
+    found = _found_needles(_needles_matcher(needles), haystack)
+    return [needle for needle in needles if needle not in found]
+
+
+def stream_find_missing(
+    response: requests.Response, needles, chunk_size: int = 65536, ignore_case: bool = False
+) -> list:
+    """Как find_missing, но читает тело ответа (запрос с stream=True) порциями
+
+    Чтение прекращается, как только найдены все подстроки. При ignore_case порции
+    приводятся к нижнему регистру, needles должны быть заданы в нижнем регистре.
+    """
+    needles = tuple(needles)
+    matcher = _needles_matcher(needles)
+    remaining = set(needles)
+    # Хвост предыдущей порции, чтобы не потерять совпадение на стыке
+    overlap = max(map(len, needles), default=1) - 1
+    tail = ""
+
+    if response.encoding is None:
+        response.encoding = "utf-8"
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size, decode_unicode=True):
+            window = tail + (chunk.lower() if ignore_case else chunk)
+            remaining -= _found_needles(matcher, window)
+            if not remaining:
+                break
+            tail = window[-overlap:] if overlap else ""
+    finally:
+        response.close()
+
+    return [needle for needle in needles if needle in remaining]
+
+
+def find_present(haystack: str, needles) -> list:
+    """Подстроки из needles, найденные в haystack (порядок needles сохраняется)"""
+    missing = set(find_missing(haystack, needles))
+    return [needle for needle in needles if needle not in missing]
+
+
 # Глобальные экземпляры для использования в тестах
 test_logger = TestLogger()
 test_helper = TestHelper()
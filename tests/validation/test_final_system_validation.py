@@ -5,220 +5,370 @@ These tests validate the complete system integration, performance,
 and production readiness of the Telegram Bot Manager.
 """
 
-import pytest
-import time
 import asyncio
-import threading
-import subprocess
-import requests
+import hashlib
 import json
-from typing import Dict, Any, List
-from pathlib import Path
-import tempfile
-import shutil
+import random
+import resource
+import sys
+import tracemalloc
+from types import MappingProxyType
+from typing import Literal, NamedTuple
+
+import aiohttp
+import pytest
 
+try:
+    import orjson  # Fast JSON serializer (optional dependency)
+except ImportError:
+    orjson = None
+
+import config_manager
 from tests.entrypoints.factories import test_data_factory
+from tests.utils import performance_monitor
+
+
+# Simulated startup steps, architecture rules and data flows checked by TestSystemIntegration
+STARTUP_SEQUENCE = (
+    "Database connection",
+    "Storage initialization",
+    "Use cases initialization",
+    "Entry points initialization",
+    "Bridge components initialization",
+    "Monitoring setup",
+    "Web server startup",
+)
+
+ARCHITECTURE_RULES = (
+    "Domain layer has no external dependencies",
+    "Use cases only depend on domain and ports",
+    "Adapters implement ports correctly",
+    "Entry points use use cases through dependency injection",
+    "No circular dependencies exist",
+)
+
+class DataFlow(NamedTuple):
+    """Path of one operation from an entry point through a use case to storage"""
+
+    entry_point: str
+    use_case: str
+    operation: str
+    storage: str
+
+
+DATA_FLOWS = (
+    DataFlow("Web", "BotManagement", "create_bot", "JSONAdapter"),
+    DataFlow("CLI", "ConversationManagement", "list_conversations", "JSONAdapter"),
+    DataFlow("API", "SystemManagement", "get_status", "JSONAdapter"),
+)
 
 
 class TestSystemIntegration:
     """Test complete system integration."""
-    
-    def test_system_startup_sequence(self):
+
+    @pytest.mark.parametrize("step", STARTUP_SEQUENCE)
+    def test_system_startup_sequence(self, step):
         """Test that the system starts up correctly with all components."""
         # This would test the actual startup sequence
         # For now, we'll simulate the test
-        
-        startup_sequence = [
-            "Database connection",
-            "Storage initialization", 
-            "Use cases initialization",
-            "Entry points initialization",
-            "Bridge components initialization",
-            "Monitoring setup",
-            "Web server startup"
-        ]
-        
-        for step in startup_sequence:
-            # Simulate startup validation
-            assert True, f"Step '{step}' completed successfully"
-    
-    def test_hexagonal_architecture_isolation(self):
+        assert True, f"Step '{step}' completed successfully"
+
+    @pytest.mark.parametrize("rule", ARCHITECTURE_RULES)
+    def test_hexagonal_architecture_isolation(self, rule):
         """Test that hexagonal architecture boundaries are properly maintained."""
         # Test that domain doesn't depend on external layers
         # Test that adapters are properly abstracted
         # Test that entry points don't leak into business logic
-        
-        architecture_rules = [
-            "Domain layer has no external dependencies",
-            "Use cases only depend on domain and ports",
-            "Adapters implement ports correctly",
-            "Entry points use use cases through dependency injection",
-            "No circular dependencies exist"
-        ]
-        
-        for rule in architecture_rules:
-            # In real implementation, this would analyze import dependencies
-            assert True, f"Architecture rule validated: {rule}"
-    
-    def test_data_flow_integrity(self):
+
+        # In real implementation, this would analyze import dependencies
+        assert True, f"Architecture rule validated: {rule}"
+
+    @pytest.mark.parametrize(
+        "flow", DATA_FLOWS, ids=lambda flow: f"{flow.entry_point}-{flow.operation}"
+    )
+    def test_data_flow_integrity(self, flow):
         """Test complete data flow from entry points to storage."""
         # Test Web -> Use Case -> Storage flow
-        # Test CLI -> Use Case -> Storage flow  
+        # Test CLI -> Use Case -> Storage flow
         # Test API -> Use Case -> Storage flow
-        
-        data_flows = [
-            {
-                "entry_point": "Web",
-                "use_case": "BotManagement", 
-                "operation": "create_bot",
-                "storage": "JSONAdapter"
-            },
-            {
-                "entry_point": "CLI",
-                "use_case": "ConversationManagement",
-                "operation": "list_conversations", 
-                "storage": "JSONAdapter"
-            },
-            {
-                "entry_point": "API",
-                "use_case": "SystemManagement",
-                "operation": "get_status",
-                "storage": "JSONAdapter"
-            }
-        ]
-        
-        for flow in data_flows:
-            # Simulate data flow validation
-            assert True, f"Data flow validated: {flow['entry_point']} -> {flow['use_case']}"
+
+        # Simulate data flow validation
+        assert True, f"Data flow validated: {flow.entry_point} -> {flow.use_case}"
+
+
+def _best_call_time(operation, rounds=5, iterations=10):
+    """Fastest per-call time of operation, in seconds, over several rounds of calls"""
+    best = float("inf")
+    for _ in range(rounds):
+        with performance_monitor.measure() as measurement:
+            for _ in range(iterations):
+                operation()
+        best = min(best, measurement.duration / iterations)
+    return best
+
+
+def _api_endpoint_operation(request):
+    """API request to the in-process application"""
+    client = request.getfixturevalue("local_app_client")
+    return lambda: client.get("/api/v2/system/health")
+
+
+def _web_page_operation(request):
+    """Web page request to the in-process application"""
+    client = request.getfixturevalue("local_app_client")
+    return lambda: client.get("/login")
+
+
+def _bot_operation(request):
+    """Create, update, read and delete a bot configuration"""
+    store = request.getfixturevalue("config_store")
+
+    def operation():
+        store.add_bot_config(999, {"bot_name": "Perf Bot"})
+        store.update_bot_config(999, {"bot_name": "Renamed Perf Bot"})
+        store.get_bot_config(999)
+        store.delete_bot_config(999)
+
+    return operation
+
+
+def _database_query_operation(request):
+    """Save the bot configurations to their JSON file and load them back"""
+    store = request.getfixturevalue("config_store")
+
+    def operation():
+        store.save_configs()
+        store.load_configs()
+
+    return operation
+
+
+async def _open_loop_load(base_url, endpoint, rate, duration, cookies=None):
+    """GET requests with Poisson arrivals at rate per second for duration seconds
+
+    Requests are sent without waiting for earlier responses (open loop), so a slow server
+    cannot throttle the offered load. Returns the number of requests sent, the number
+    answered with 2xx and the time from the first request to the last response.
+    """
+    url = f"{base_url}{endpoint}"
+    connector = aiohttp.TCPConnector(limit=0)
+    async with aiohttp.ClientSession(connector=connector, cookies=cookies) as session:
+
+        async def fetch():
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    return 200 <= response.status < 300
+            except aiohttp.ClientError:
+                return False
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        next_arrival = start
+        tasks = []
+        while next_arrival < start + duration:
+            await asyncio.sleep(max(0.0, next_arrival - loop.time()))
+            tasks.append(asyncio.create_task(fetch()))
+            next_arrival += random.expovariate(rate)
+        results = await asyncio.gather(*tasks)
+        elapsed = loop.time() - start
+
+    return len(results), sum(results), elapsed
+
+
+def _measure_resource_usage(workload):
+    """Peak RSS of the process before and after workload and the peak Python heap during it, MB"""
+    # ru_maxrss: kilobytes on Linux, bytes on macOS
+    rss_divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+    rss_before_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / rss_divisor
+    tracemalloc.start()
+    try:
+        workload()
+        _, heap_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    rss_after_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / rss_divisor
+
+    return {
+        "rss_before_mb": rss_before_mb,
+        "rss_after_mb": rss_after_mb,
+        "heap_peak_mb": heap_peak / 2**20,
+    }
 
 
 class TestPerformanceValidation:
     """Test system performance under various conditions."""
     
-    def test_response_time_targets(self):
+    @pytest.mark.parametrize(
+        "make_operation, target_time",
+        [
+            pytest.param(_api_endpoint_operation, 0.2, id="api_endpoints"),  # 200ms
+            pytest.param(_web_page_operation, 1.0, id="web_pages"),  # 1s
+            pytest.param(_bot_operation, 0.5, id="bot_operations"),  # 500ms
+            pytest.param(_database_query_operation, 0.1, id="database_queries"),  # 100ms
+        ],
+    )
+    def test_response_time_targets(self, request, make_operation, target_time):
         """Test that response time targets are met."""
-        targets = {
-            "api_endpoints": 0.2,  # 200ms
-            "web_pages": 1.0,      # 1s
-            "bot_operations": 0.5,  # 500ms
-            "database_queries": 0.1 # 100ms
-        }
-        
-        for component, target_time in targets.items():
-            # Simulate performance measurement
-            simulated_time = 0.1  # Good performance
-            assert simulated_time < target_time, f"{component} response time {simulated_time}s exceeds target {target_time}s"
-    
-    def test_throughput_targets(self):
+        response_time = _best_call_time(make_operation(request))
+        assert (
+            response_time < target_time
+        ), f"Response time {response_time:.4f}s exceeds target {target_time}s"
+
+    # Bot messages arrive through Telegram rather than HTTP, so they have no throughput target here
+    @pytest.mark.parametrize(
+        "endpoint, target_per_minute",
+        [
+            pytest.param("/api/v2/system/health", 1000, id="api_requests_per_minute"),
+            pytest.param("/api/v2/bots", 5000, id="database_operations_per_minute"),
+        ],
+    )
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("workload")
+    @pytest.mark.asyncio
+    async def test_throughput_targets(self, authenticated_session, endpoint, target_per_minute):
         """Test that throughput targets are met."""
-        targets = {
-            "concurrent_users": 100,
-            "api_requests_per_minute": 1000,
-            "bot_messages_per_minute": 500,
-            "database_operations_per_minute": 5000
-        }
-        
-        for metric, target_value in targets.items():
-            # Simulate throughput measurement
-            simulated_value = target_value * 1.2  # 20% above target
-            assert simulated_value >= target_value, f"{metric} {simulated_value} below target {target_value}"
-    
-    def test_resource_usage_limits(self):
+        duration = 3.0
+        sent, succeeded, elapsed = await _open_loop_load(
+            authenticated_session.base_url,
+            endpoint,
+            rate=target_per_minute / 60,
+            duration=duration,
+            cookies=authenticated_session.session.cookies.get_dict(),
+        )
+
+        assert succeeded == sent, f"{sent - succeeded} of {sent} requests to {endpoint} failed"
+        # The server keeps up when the last response arrives shortly after the last request
+        assert (
+            elapsed <= duration + 1.0
+        ), f"{endpoint} fell behind {target_per_minute}/min: drained {elapsed - duration:.2f}s late"
+
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("workload")
+    @pytest.mark.asyncio
+    async def test_concurrent_users_target(self, authenticated_session):
+        """Test that the target number of concurrent users is served."""
+        concurrent_users = 100
+        url = f"{authenticated_session.base_url}/api/v2/system/health"
+
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0),
+            cookies=authenticated_session.session.cookies.get_dict(),
+        ) as session:
+
+            async def fetch():
+                async with session.get(url) as response:
+                    await response.read()
+                    return response.status
+
+            statuses = await asyncio.gather(*(fetch() for _ in range(concurrent_users)))
+
+        failed = [status for status in statuses if not 200 <= status < 300]
+        assert not failed, f"{len(failed)} of {concurrent_users} concurrent users failed: {failed}"
+
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("workload")
+    def test_resource_usage_limits(self, tmp_path):
         """Test that resource usage is within acceptable limits."""
-        limits = {
-            "memory_baseline_mb": 512,
-            "memory_under_load_mb": 1024,
-            "cpu_baseline_percent": 50,
-            "cpu_under_load_percent": 80,
-            "storage_growth_mb_per_day": 100
-        }
-        
-        for resource, limit in limits.items():
-            # Simulate resource measurement
-            simulated_usage = limit * 0.8  # 80% of limit
-            assert simulated_usage <= limit, f"{resource} usage {simulated_usage} exceeds limit {limit}"
-    
-    def test_scalability_characteristics(self):
+        # CPU share and storage growth describe the running service over time;
+        # tests/performance measures CPU against the live application
+        memory_baseline_mb = 512
+        memory_under_load_mb = 1024
+
+        store = config_manager.ConfigStore(str(tmp_path / "bot_configs.json"))
+
+        def workload():
+            for bot_id in range(1, 101):
+                store.add_bot_config(bot_id, test_data_factory.create_bot_config(id=bot_id))
+                store.get_all_bot_configs()
+            store.save_configs()
+
+        usage = _measure_resource_usage(workload)
+
+        assert (
+            usage["rss_before_mb"] <= memory_baseline_mb
+        ), f"Baseline RSS {usage['rss_before_mb']:.0f} MB exceeds limit {memory_baseline_mb} MB"
+        assert (
+            usage["rss_after_mb"] <= memory_under_load_mb
+        ), f"RSS under load {usage['rss_after_mb']:.0f} MB exceeds limit {memory_under_load_mb} MB"
+        heap_limit_mb = memory_under_load_mb - memory_baseline_mb
+        assert (
+            usage["heap_peak_mb"] <= heap_limit_mb
+        ), f"Workload heap peak {usage['heap_peak_mb']:.1f} MB exceeds {heap_limit_mb} MB"
+
+    def test_scalability_characteristics(self, tmp_path):
         """Test system scalability characteristics."""
-        scalability_tests = [
-            {
-                "metric": "response_time_with_load",
-                "baseline": 0.1,
-                "with_10x_load": 0.3,
-                "acceptable_degradation": 3.0
-            },
-            {
-                "metric": "memory_usage_per_bot",
-                "single_bot": 50,
-                "per_additional_bot": 20,
-                "max_acceptable": 100
-            }
-        ]
-        
-        for test in scalability_tests:
-            if "acceptable_degradation" in test:
-                degradation = test["with_10x_load"] / test["baseline"]
-                assert degradation <= test["acceptable_degradation"], f"Performance degradation {degradation}x exceeds acceptable {test['acceptable_degradation']}x"
-            elif "max_acceptable" in test:
-                usage = test["single_bot"] + test["per_additional_bot"] * 10
-                assert usage <= test["max_acceptable"], f"Resource usage {usage} exceeds max {test['max_acceptable']}"
-
-
-class TestSecurityValidation:
-    """Test security measures and protections."""
-    
-    def test_authentication_security(self):
-        """Test authentication security measures."""
-        security_checks = [
-            "Password hashing using secure algorithms",
-            "JWT tokens with proper expiration",
-            "Session management with secure cookies",
-            "Rate limiting on authentication endpoints",
-            "Account lockout after failed attempts"
-        ]
-        
-        for check in security_checks:
-            # In real implementation, would verify actual security measures
-            assert True, f"Security check passed: {check}"
-    
-    def test_data_protection(self):
-        """Test data protection measures."""
-        protection_measures = [
-            "Sensitive data filtering in logs",
-            "Encrypted storage of tokens and keys",
-            "Secure transmission over HTTPS",
-            "Input validation and sanitization",
-            "SQL injection prevention"
-        ]
-        
-        for measure in protection_measures:
-            assert True, f"Data protection verified: {measure}"
-    
-    def test_api_security(self):
-        """Test API security measures."""
-        api_security = [
-            "JWT token validation",
-            "CORS configuration",
-            "Rate limiting per endpoint",
-            "Input validation",
-            "Error message sanitization"
-        ]
-        
-        for security in api_security:
-            assert True, f"API security verified: {security}"
-    
-    def test_network_security(self):
-        """Test network security configuration."""
-        network_security = [
-            "Firewall rules configured",
-            "Only necessary ports exposed",
-            "TLS/SSL properly configured",
-            "Security headers implemented",
-            "Access logging enabled"
-        ]
-        
-        for security in network_security:
-            assert True, f"Network security verified: {security}"
+        baseline_bots = 10
+        max_degradation = 3.0  # bot lookup with 10x bots
+        max_mb_per_bot = 20
+
+        store = config_manager.ConfigStore(str(tmp_path / "bot_configs.json"))
+        for bot_id in range(1, baseline_bots + 1):
+            store.add_bot_config(bot_id, {"bot_name": f"Bot {bot_id}"})
+        baseline = _best_call_time(lambda: store.get_bot_config(baseline_bots), iterations=1000)
+
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            for bot_id in range(baseline_bots + 1, baseline_bots * 10 + 1):
+                store.add_bot_config(bot_id, {"bot_name": f"Bot {bot_id}"})
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        with_10x_load = _best_call_time(
+            lambda: store.get_bot_config(baseline_bots), iterations=1000
+        )
+
+        degradation = with_10x_load / baseline
+        assert (
+            degradation <= max_degradation
+        ), f"Performance degradation {degradation:.1f}x exceeds acceptable {max_degradation}x"
+
+        mb_per_bot = (after - before) / (baseline_bots * 9) / 2**20
+        assert (
+            mb_per_bot <= max_mb_per_bot
+        ), f"Memory per additional bot {mb_per_bot:.3f} MB exceeds max {max_mb_per_bot} MB"
+
+
+# Metrics the monitoring system must collect
+REQUIRED_METRICS = frozenset(
+    {
+        "system.cpu.percent",
+        "system.memory.percent",
+        "system.memory.rss_mb",
+        "app.requests.total",
+        "app.requests.errors",
+        "app.response_time",
+        "app.active_bots",
+        "app.cache.hit_rate",
+    }
+)
+
+
+# Health checks the monitoring system runs
+HEALTH_CHECKS = (
+    "database_connectivity",
+    "storage_accessibility",
+    "memory_usage",
+    "external_api_connectivity",
+    "service_availability",
+)
+
+
+class AlertRule(NamedTuple):
+    """Monitoring alert: fires when the metric crosses threshold"""
+
+    name: str
+    threshold: float
+    severity: Literal["warning", "critical"]
+
+
+ALERT_RULES = (
+    AlertRule("high_memory_usage", 80, "warning"),
+    AlertRule("critical_memory_usage", 90, "critical"),
+    AlertRule("high_error_rate", 5, "critical"),
+)
 
 
 class TestMonitoringValidation:
@@ -226,428 +376,373 @@ class TestMonitoringValidation:
     
     def test_metrics_collection(self):
         """Test that all required metrics are collected."""
-        required_metrics = [
-            "system.cpu.percent",
-            "system.memory.percent", 
-            "system.memory.rss_mb",
-            "app.requests.total",
-            "app.requests.errors",
-            "app.response_time",
-            "app.active_bots",
-            "app.cache.hit_rate"
-        ]
-        
         # Simulate metrics collection
-        collected_metrics = {metric: 42.0 for metric in required_metrics}
-        
-        for metric in required_metrics:
-            assert metric in collected_metrics, f"Required metric {metric} not collected"
-            assert isinstance(collected_metrics[metric], (int, float)), f"Metric {metric} has invalid type"
-    
-    def test_health_checks(self):
-        """Test that health checks are working."""
-        health_checks = [
-            "database_connectivity",
-            "storage_accessibility", 
-            "memory_usage",
-            "external_api_connectivity",
-            "service_availability"
+        collected_metrics = dict.fromkeys(REQUIRED_METRICS, 42.0)
+
+        missing = REQUIRED_METRICS - collected_metrics.keys()
+        assert not missing, f"Required metrics not collected: {sorted(missing)}"
+        invalid = [
+            metric
+            for metric, value in collected_metrics.items()
+            if not isinstance(value, (int, float))
         ]
-        
-        for check in health_checks:
-            # Simulate health check
-            health_status = "healthy"
-            assert health_status == "healthy", f"Health check {check} failed: {health_status}"
-    
+        assert not invalid, f"Metrics with invalid type: {invalid}"
+
+    @pytest.mark.parametrize("check", HEALTH_CHECKS)
+    def test_health_checks(self, check):
+        """Test that health checks are working."""
+        # Simulate health check
+        health_status = "healthy"
+        assert health_status == "healthy", f"Health check {check} failed: {health_status}"
+
     def test_alerting_system(self):
         """Test that alerting system is properly configured."""
-        alert_rules = [
-            {
-                "name": "high_memory_usage",
-                "threshold": 80,
-                "severity": "warning"
-            },
-            {
-                "name": "critical_memory_usage", 
-                "threshold": 90,
-                "severity": "critical"
-            },
-            {
-                "name": "high_error_rate",
-                "threshold": 5,
-                "severity": "critical"
-            }
-        ]
-        
-        for rule in alert_rules:
+        for rule in ALERT_RULES:
             # Verify alert rule configuration
-            assert rule["name"], "Alert rule must have a name"
-            assert rule["threshold"] > 0, "Alert threshold must be positive"
-            assert rule["severity"] in ["warning", "critical"], "Invalid alert severity"
-    
-    def test_logging_system(self):
-        """Test that logging system is properly configured."""
-        logging_requirements = [
-            "Structured logging enabled",
-            "Log rotation configured", 
-            "Sensitive data filtering active",
-            "Multiple log levels supported",
-            "Log aggregation working",
-            "Error tracking functional"
-        ]
-        
-        for requirement in logging_requirements:
-            assert True, f"Logging requirement met: {requirement}"
+            assert rule.name, "Alert rule must have a name"
+            assert rule.threshold > 0, "Alert threshold must be positive"
+            assert rule.severity in ("warning", "critical"), "Invalid alert severity"
 
 
-class TestDataIntegrityValidation:
-    """Test data integrity and consistency."""
-    
-    def test_data_migration_integrity(self):
-        """Test that data migration preserves integrity."""
-        # Test bot configuration migration
-        original_bot = {
+def _canonical_json(data):
+    """Canonical UTF-8 JSON of data: sorted keys, no whitespace (read-only mappings included)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=dict)
+    return json.dumps(
+        data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=dict
+    ).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def original_bot():
+    """Bot configuration before migration (read-only, shared by the module)"""
+    return MappingProxyType(
+        {
             "id": 1,
-            "config": {
-                "bot_name": "Test Bot",
-                "telegram_token": "test_token",
-                "openai_api_key": "test_key"
-            },
-            "status": "stopped"
+            "config": MappingProxyType(
+                {
+                    "bot_name": "Test Bot",
+                    "telegram_token": "test_token",
+                    "openai_api_key": "test_key",
+                }
+            ),
+            "status": "stopped",
         }
-        
-        # Simulate migration
-        migrated_bot = {
+    )
+
+
+@pytest.fixture(scope="module")
+def migrated_bot():
+    """Bot configuration after migration (read-only, shared by the module)"""
+    return MappingProxyType(
+        {
             "id": 1,
             "name": "Test Bot",
-            "token": "test_token", 
+            "token": "test_token",
             "openai_api_key": "test_key",
-            "status": "stopped"
+            "status": "stopped",
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def backup_test_data():
+    """System data before backup (read-only, shared by the module)"""
+    return MappingProxyType(
+        {
+            "bots": ({"id": 1, "name": "Test Bot"},),
+            "conversations": ({"id": 1, "bot_id": 1},),
+            "system_config": MappingProxyType({"version": "2.0.0"}),
         }
-        
+    )
+
+
+class TestDataIntegrityValidation:
+    """Test data integrity and consistency."""
+
+    def test_data_migration_integrity(self, original_bot, migrated_bot):
+        """Test that data migration preserves integrity."""
         # Verify data integrity
         assert migrated_bot["id"] == original_bot["id"]
         assert migrated_bot["name"] == original_bot["config"]["bot_name"]
         assert migrated_bot["token"] == original_bot["config"]["telegram_token"]
         assert migrated_bot["status"] == original_bot["status"]
-    
-    def test_backup_restore_integrity(self):
+
+    def test_backup_restore_integrity(self, backup_test_data, tmp_path):
         """Test backup and restore data integrity."""
-        # Test data before backup
-        test_data = {
-            "bots": [{"id": 1, "name": "Test Bot"}],
-            "conversations": [{"id": 1, "bot_id": 1}],
-            "system_config": {"version": "2.0.0"}
-        }
-        
-        # Simulate backup creation
-        backup_data = test_data.copy()
-        
-        # Simulate restore
-        restored_data = backup_data.copy()
-        
-        # Verify data integrity
-        assert restored_data == test_data, "Backup/restore data integrity failed"
-    
-    def test_concurrent_data_access(self):
+        expected_digest = hashlib.blake2b(_canonical_json(backup_test_data)).digest()
+
+        # Backup to a file and restore from it
+        backup_file = tmp_path / "backup.json"
+        backup_file.write_bytes(_canonical_json(backup_test_data))
+        restored_data = json.loads(backup_file.read_bytes())
+
+        with open(backup_file, "rb") as f:
+            backup_digest = hashlib.file_digest(f, "blake2b").digest()
+        assert backup_digest == expected_digest, "Backup file differs from the original data"
+        restored_digest = hashlib.blake2b(_canonical_json(restored_data)).digest()
+        assert restored_digest == expected_digest, "Backup/restore data integrity failed"
+
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("workload")
+    @pytest.mark.asyncio
+    async def test_concurrent_data_access(self, tmp_path):
         """Test data integrity under concurrent access."""
-        # Simulate concurrent operations
-        operations = [
-            {"type": "create_bot", "data": {"name": "Bot 1"}},
-            {"type": "update_bot", "id": 1, "data": {"name": "Updated Bot"}},
-            {"type": "delete_bot", "id": 1},
-            {"type": "list_bots", "data": {}}
-        ]
-        
-        # In real implementation, would test actual concurrent access
-        for operation in operations:
-            assert operation["type"] in ["create_bot", "update_bot", "delete_bot", "list_bots"]
+        store = config_manager.ConfigStore(str(tmp_path / "bot_configs.json"))
+        semaphore = asyncio.Semaphore(10)
 
+        async def bot_lifecycle(bot_id):
+            # create -> update -> list -> delete (odd bots) for one bot, in order;
+            # different bots run concurrently in worker threads
+            async with semaphore:
+                await asyncio.to_thread(store.add_bot_config, bot_id, {"bot_name": f"Bot {bot_id}"})
+                await asyncio.to_thread(
+                    store.update_bot_config, bot_id, {"bot_name": f"Updated Bot {bot_id}"}
+                )
+                await asyncio.to_thread(store.get_all_bot_configs)
+                if bot_id % 2:
+                    await asyncio.to_thread(store.delete_bot_config, bot_id)
 
-class TestProductionReadiness:
-    """Test production readiness criteria."""
-    
-    def test_deployment_configuration(self):
-        """Test deployment configuration readiness."""
-        deployment_configs = [
-            "Environment variables properly set",
-            "Production database configured",
-            "Redis cache configured", 
-            "SSL certificates installed",
-            "Reverse proxy configured",
-            "Firewall rules applied",
-            "Monitoring setup complete",
-            "Backup procedures configured"
-        ]
-        
-        for config in deployment_configs:
-            assert True, f"Deployment configuration verified: {config}"
-    
-    def test_error_handling_robustness(self):
-        """Test error handling robustness."""
-        error_scenarios = [
-            "Database connection failure",
-            "External API timeout",
-            "Invalid user input",
-            "File system errors",
-            "Memory exhaustion",
-            "Network connectivity issues"
-        ]
-        
-        for scenario in error_scenarios:
-            # Test that system handles errors gracefully
-            assert True, f"Error handling verified for: {scenario}"
-    
-    def test_recovery_mechanisms(self):
-        """Test system recovery mechanisms."""
-        recovery_tests = [
-            "Automatic service restart",
-            "Database connection recovery",
-            "Failed task retry logic",
-            "Graceful degradation",
-            "Circuit breaker functionality",
-            "Health check recovery"
-        ]
-        
-        for test in recovery_tests:
-            assert True, f"Recovery mechanism verified: {test}"
-    
-    def test_documentation_completeness(self):
-        """Test that documentation is complete."""
-        required_docs = [
-            "User Guide",
-            "Administrator Guide", 
-            "Developer Guide",
-            "API Documentation",
-            "Installation Guide",
-            "Troubleshooting Guide",
-            "Security Guide"
-        ]
-        
-        for doc in required_docs:
-            # Check that documentation exists and is complete
-            assert True, f"Documentation verified: {doc}"
-    
-    def test_maintenance_procedures(self):
-        """Test maintenance procedures."""
-        maintenance_procedures = [
-            "Log rotation working",
-            "Database maintenance scripts",
-            "Backup verification procedures",
-            "Update/upgrade procedures", 
-            "Monitoring dashboard accessible",
-            "Alert notification working"
-        ]
-        
-        for procedure in maintenance_procedures:
-            assert True, f"Maintenance procedure verified: {procedure}"
+        bot_ids = range(1, 26)  # 100 operations
+        results = await asyncio.gather(
+            *(bot_lifecycle(bot_id) for bot_id in bot_ids), return_exceptions=True
+        )
 
+        errors = [result for result in results if isinstance(result, Exception)]
+        assert not errors, f"Concurrent operations failed: {errors}"
 
-class TestBusinessLogicValidation:
-    """Test business logic correctness."""
-    
-    def test_bot_lifecycle_management(self):
-        """Test complete bot lifecycle management."""
-        lifecycle_stages = [
-            "Bot creation with valid configuration",
-            "Bot startup and initialization",
-            "Message processing and responses",
-            "Configuration updates while running",
-            "Graceful shutdown",
-            "Bot deletion and cleanup"
-        ]
-        
-        for stage in lifecycle_stages:
-            assert True, f"Bot lifecycle stage verified: {stage}"
-    
-    def test_conversation_management(self):
-        """Test conversation management features."""
-        conversation_features = [
-            "Conversation creation and tracking",
-            "Message history storage",
-            "Context management",
-            "User session handling",
-            "Conversation cleanup",
-            "Export functionality"
-        ]
-        
-        for feature in conversation_features:
-            assert True, f"Conversation feature verified: {feature}"
-    
-    def test_system_management(self):
-        """Test system management features."""
-        system_features = [
-            "System status monitoring",
-            "Configuration management",
-            "User management",
-            "Backup operations", 
-            "Update procedures",
-            "Diagnostic tools"
-        ]
-        
-        for feature in system_features:
-            assert True, f"System feature verified: {feature}"
-    
-    def test_integration_with_external_services(self):
-        """Test integration with external services."""
-        external_integrations = [
-            "Telegram Bot API connectivity",
-            "OpenAI API integration",
-            "Database operations",
-            "File system operations",
-            "Logging system",
-            "Monitoring system"
-        ]
-        
-        for integration in external_integrations:
-            assert True, f"External integration verified: {integration}"
+        expected = {bot_id: f"Updated Bot {bot_id}" for bot_id in bot_ids if bot_id % 2 == 0}
+        listed = {
+            bot_id: bot["config"]["bot_name"] for bot_id, bot in store.get_all_bot_configs().items()
+        }
+        assert listed == expected, "Final bot listing is inconsistent with the operations"
 
+        # The same state survives a save/load round trip
+        store.save_configs()
+        reloaded = config_manager.ConfigStore(store.path)
+        reloaded.load_configs()
+        assert reloaded.configs.keys() == expected.keys()
 
-class TestUserAcceptance:
-    """Test user acceptance criteria."""
-    
-    def test_web_interface_usability(self):
-        """Test web interface usability."""
-        usability_criteria = [
-            "Intuitive navigation",
-            "Responsive design",
-            "Fast page load times",
-            "Clear error messages",
-            "Accessibility compliance",
-            "Mobile compatibility"
-        ]
-        
-        for criteria in usability_criteria:
-            assert True, f"Web usability verified: {criteria}"
-    
-    def test_cli_interface_usability(self):
-        """Test CLI interface usability."""
-        cli_criteria = [
-            "Clear command structure",
-            "Helpful error messages",
-            "Comprehensive help system",
-            "Tab completion support",
-            "Output formatting options",
-            "Scriptability"
-        ]
-        
-        for criteria in cli_criteria:
-            assert True, f"CLI usability verified: {criteria}"
-    
-    def test_api_interface_usability(self):
-        """Test API interface usability."""
-        api_criteria = [
-            "RESTful design principles",
-            "Clear endpoint naming", 
-            "Comprehensive documentation",
-            "Consistent response formats",
-            "Proper HTTP status codes",
-            "Rate limiting information"
-        ]
-        
-        for criteria in api_criteria:
-            assert True, f"API usability verified: {criteria}"
-    
-    def test_feature_completeness(self):
-        """Test that all required features are implemented."""
-        required_features = [
-            "Bot creation and management",
-            "Conversation tracking",
-            "AI integration (OpenAI)",
-            "Voice message support",
-            "Marketplace integration",
-            "System monitoring", 
-            "Backup and restore",
-            "User authentication",
-            "Multi-bot support",
-            "Performance optimization"
-        ]
-        
-        for feature in required_features:
-            assert True, f"Required feature verified: {feature}"
 
+# Checklist items that are not verified automatically yet, by category
+# (the category is the former test method name)
+CHECKLIST = {
+    "authentication_security": (
+        "Password hashing using secure algorithms",
+        "JWT tokens with proper expiration",
+        "Session management with secure cookies",
+        "Rate limiting on authentication endpoints",
+        "Account lockout after failed attempts",
+    ),
+    "data_protection": (
+        "Sensitive data filtering in logs",
+        "Encrypted storage of tokens and keys",
+        "Secure transmission over HTTPS",
+        "Input validation and sanitization",
+        "SQL injection prevention",
+    ),
+    "api_security": (
+        "JWT token validation",
+        "CORS configuration",
+        "Rate limiting per endpoint",
+        "Input validation",
+        "Error message sanitization",
+    ),
+    "network_security": (
+        "Firewall rules configured",
+        "Only necessary ports exposed",
+        "TLS/SSL properly configured",
+        "Security headers implemented",
+        "Access logging enabled",
+    ),
+    "logging_system": (
+        "Structured logging enabled",
+        "Log rotation configured",
+        "Sensitive data filtering active",
+        "Multiple log levels supported",
+        "Log aggregation working",
+        "Error tracking functional",
+    ),
+    "deployment_configuration": (
+        "Environment variables properly set",
+        "Production database configured",
+        "Redis cache configured",
+        "SSL certificates installed",
+        "Reverse proxy configured",
+        "Firewall rules applied",
+        "Monitoring setup complete",
+        "Backup procedures configured",
+    ),
+    "error_handling_robustness": (
+        "Database connection failure",
+        "External API timeout",
+        "Invalid user input",
+        "File system errors",
+        "Memory exhaustion",
+        "Network connectivity issues",
+    ),
+    "recovery_mechanisms": (
+        "Automatic service restart",
+        "Database connection recovery",
+        "Failed task retry logic",
+        "Graceful degradation",
+        "Circuit breaker functionality",
+        "Health check recovery",
+    ),
+    "documentation_completeness": (
+        "User Guide",
+        "Administrator Guide",
+        "Developer Guide",
+        "API Documentation",
+        "Installation Guide",
+        "Troubleshooting Guide",
+        "Security Guide",
+    ),
+    "maintenance_procedures": (
+        "Log rotation working",
+        "Database maintenance scripts",
+        "Backup verification procedures",
+        "Update/upgrade procedures",
+        "Monitoring dashboard accessible",
+        "Alert notification working",
+    ),
+    "bot_lifecycle_management": (
+        "Bot creation with valid configuration",
+        "Bot startup and initialization",
+        "Message processing and responses",
+        "Configuration updates while running",
+        "Graceful shutdown",
+        "Bot deletion and cleanup",
+    ),
+    "conversation_management": (
+        "Conversation creation and tracking",
+        "Message history storage",
+        "Context management",
+        "User session handling",
+        "Conversation cleanup",
+        "Export functionality",
+    ),
+    "system_management": (
+        "System status monitoring",
+        "Configuration management",
+        "User management",
+        "Backup operations",
+        "Update procedures",
+        "Diagnostic tools",
+    ),
+    # Telegram and OpenAI connectivity is probed by test_external_services_reachable
+    "integration_with_external_services": (
+        "Database operations",
+        "File system operations",
+        "Logging system",
+        "Monitoring system",
+    ),
+    "web_interface_usability": (
+        "Intuitive navigation",
+        "Responsive design",
+        "Fast page load times",
+        "Clear error messages",
+        "Accessibility compliance",
+        "Mobile compatibility",
+    ),
+    "cli_interface_usability": (
+        "Clear command structure",
+        "Helpful error messages",
+        "Comprehensive help system",
+        "Tab completion support",
+        "Output formatting options",
+        "Scriptability",
+    ),
+    "api_interface_usability": (
+        "RESTful design principles",
+        "Clear endpoint naming",
+        "Comprehensive documentation",
+        "Consistent response formats",
+        "Proper HTTP status codes",
+        "Rate limiting information",
+    ),
+    "feature_completeness": (
+        "Bot creation and management",
+        "Conversation tracking",
+        "AI integration (OpenAI)",
+        "Voice message support",
+        "Marketplace integration",
+        "System monitoring",
+        "Backup and restore",
+        "User authentication",
+        "Multi-bot support",
+        "Performance optimization",
+    ),
+    "security_compliance": (
+        "OWASP Top 10 vulnerabilities addressed",
+        "Data encryption in transit and at rest",
+        "Secure authentication mechanisms",
+        "Input validation and sanitization",
+        "Access control and authorization",
+        "Security logging and monitoring",
+    ),
+    "data_privacy_compliance": (
+        "Personal data encryption",
+        "Data retention policies",
+        "User consent management",
+        "Data portability support",
+        "Right to deletion (GDPR)",
+        "Privacy by design principles",
+    ),
+    "operational_compliance": (
+        "Audit logging enabled",
+        "Change management procedures",
+        "Backup and recovery procedures",
+        "Incident response procedures",
+        "Documentation standards met",
+        "Access control procedures",
+    ),
+}
 
-class TestComplianceValidation:
-    """Test compliance with standards and regulations."""
-    
-    def test_security_compliance(self):
-        """Test security compliance standards."""
-        security_standards = [
-            "OWASP Top 10 vulnerabilities addressed",
-            "Data encryption in transit and at rest",
-            "Secure authentication mechanisms",
-            "Input validation and sanitization", 
-            "Access control and authorization",
-            "Security logging and monitoring"
-        ]
-        
-        for standard in security_standards:
-            assert True, f"Security compliance verified: {standard}"
-    
-    def test_data_privacy_compliance(self):
-        """Test data privacy compliance."""
-        privacy_requirements = [
-            "Personal data encryption",
-            "Data retention policies",
-            "User consent management",
-            "Data portability support",
-            "Right to deletion (GDPR)",
-            "Privacy by design principles"
-        ]
-        
-        for requirement in privacy_requirements:
-            assert True, f"Privacy compliance verified: {requirement}"
-    
-    def test_operational_compliance(self):
-        """Test operational compliance requirements."""
-        operational_requirements = [
-            "Audit logging enabled",
-            "Change management procedures",
-            "Backup and recovery procedures",
-            "Incident response procedures",
-            "Documentation standards met",
-            "Access control procedures"
-        ]
-        
-        for requirement in operational_requirements:
-            assert True, f"Operational compliance verified: {requirement}"
-
-
-def test_final_system_validation():
-    """Final comprehensive system validation test."""
-    validation_results = {
-        "system_integration": True,
-        "performance_targets": True,
-        "security_measures": True,
-        "monitoring_systems": True,
-        "data_integrity": True,
-        "production_readiness": True,
-        "business_logic": True,
-        "user_acceptance": True,
-        "compliance": True
-    }
-    
-    failed_validations = [k for k, v in validation_results.items() if not v]
-    
-    assert len(failed_validations) == 0, f"System validation failed for: {failed_validations}"
-    
-    print("🎉 FINAL SYSTEM VALIDATION PASSED!")
-    print("✅ All validation criteria met")
-    print("🚀 System is ready for production deployment")
-    print("⭐ Hexagonal architecture successfully implemented")
-    print("📊 Performance targets achieved")
-    print("🔒 Security measures verified")
-    print("📈 Monitoring systems operational")
-    print("💾 Data integrity confirmed")
-    print("👥 User acceptance criteria met")
-    print("📋 Compliance requirements satisfied")
-    print("")
-    print("🎯 TELEGRAM BOT MANAGER V2.0 - PRODUCTION READY! 🎯")
 
+def _not_automated(item):
+    """Default validator for checklist items that have no automated check yet"""
+    return True
 
 
+# category -> validator(item) -> bool; categories without an entry use _not_automated
+VALIDATORS = {}
 
 
+@pytest.mark.parametrize(
+    "category, item",
+    [(category, item) for category, items in CHECKLIST.items() for item in items],
+)
+def test_checklist(category, item):
+    """Test a production readiness checklist item with its category validator."""
+    validator = VALIDATORS.get(category, _not_automated)
+    assert validator(item), f"{category}: {item}"
 
 
+# External APIs the bots depend on; any HTTP answer below 500 means the service is reachable
+EXTERNAL_SERVICE_PROBES = (
+    ("Telegram Bot API", "https://api.telegram.org"),
+    ("OpenAI API", "https://api.openai.com/v1/models"),
+)
 
+
+@pytest.mark.nightly
+@pytest.mark.asyncio
+async def test_external_services_reachable():
+    """Test that the external services the bots depend on are reachable."""
+
+    async def probe(session, url):
+        async with session.head(url) as response:
+            return response.status
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
+        results = await asyncio.gather(
+            *(probe(session, url) for _, url in EXTERNAL_SERVICE_PROBES), return_exceptions=True
+        )
+
+    failed = {
+        name: result
+        for (name, _), result in zip(EXTERNAL_SERVICE_PROBES, results)
+        if isinstance(result, Exception) or result >= 500
+    }
+    assert not failed, f"External services unreachable: {failed}"